@@ -11,6 +11,11 @@ from dotenv import load_dotenv
 import re
 import subprocess
 import shutil
+import threading
+import contextlib
+import uuid
+import random
+import wave
 
 # Load environment variables
 load_dotenv()
@@ -21,11 +26,71 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__, static_folder='static', static_url_path='')
 
+# WebSocket support for live transcription is optional
+try:
+    from flask_sock import Sock
+    sock = Sock(app)
+except ImportError:
+    sock = None
+
 # Configuration for transcription modes
 TRANSCRIPTION_MODE = os.getenv('TRANSCRIPTION_MODE', 'hybrid')  # 'online', 'offline', 'hybrid'
 WHISPER_CPP_PATH = os.getenv('WHISPER_CPP_PATH', './whisper.cpp/build/bin/whisper-cli')
 WHISPER_MODEL_PATH = os.getenv('WHISPER_MODEL_PATH', './whisper.cpp/models/ggml-base.bin')
 
+# Configuration for batch ingestion
+TRANSCRIPTION_WORKERS = int(os.getenv('TRANSCRIPTION_WORKERS', '2'))
+BATCH_IMPORT_DIR = os.getenv('BATCH_IMPORT_DIR', 'Imports')
+
+# Configuration for job scheduling
+PRIORITY_CLASSES = {'interactive': 0, 'normal': 1, 'bulk': 2}
+INTERACTIVE_MAX_SECONDS = float(os.getenv('INTERACTIVE_MAX_SECONDS', '300'))
+TRANSCRIPTION_CHUNK_SECONDS = float(os.getenv('TRANSCRIPTION_CHUNK_SECONDS', '300'))
+
+# Configuration for incremental re-transcription (requires numpy)
+INCREMENTAL_TRANSCRIPTION = os.getenv('INCREMENTAL_TRANSCRIPTION', 'true').lower() == 'true'
+FINGERPRINT_WINDOW_SECONDS = float(os.getenv('FINGERPRINT_WINDOW_SECONDS', '3'))
+INCREMENTAL_MIN_REUSE_SECONDS = float(os.getenv('INCREMENTAL_MIN_REUSE_SECONDS', '30'))
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.ogg', '.flac', '.webm', '.mp4', '.aac')
+
+# Configuration for live streaming transcription
+WHISPER_SERVER_URL = os.getenv('WHISPER_SERVER_URL', '')  # warm whisper.cpp server, e.g. http://127.0.0.1:8080
+LIVE_SAMPLE_RATE = 16000
+LIVE_WINDOW_SECONDS = float(os.getenv('LIVE_WINDOW_SECONDS', '12'))
+LIVE_STEP_SECONDS = float(os.getenv('LIVE_STEP_SECONDS', '2'))
+LIVE_LATENCY_BUDGET = float(os.getenv('LIVE_LATENCY_BUDGET', '2'))
+
+# Configuration for speaker diarization (optional, CPU-only, requires numpy)
+DIARIZATION_ENABLED = os.getenv('DIARIZATION_ENABLED', 'false').lower() == 'true'
+DIARIZATION_THRESHOLD = float(os.getenv('DIARIZATION_THRESHOLD', '0.25'))
+DIARIZATION_MAX_SPEAKERS = int(os.getenv('DIARIZATION_MAX_SPEAKERS', '8'))
+
+# Configuration for startup
+PRELOAD_WHISPER_MODEL = os.getenv('PRELOAD_WHISPER_MODEL', 'false').lower() == 'true'
+AVAILABILITY_CACHE_SECONDS = float(os.getenv('AVAILABILITY_CACHE_SECONDS', '30'))
+RESUME_INTERRUPTED_JOBS = os.getenv('RESUME_INTERRUPTED_JOBS', 'true').lower() == 'true'
+
+# Configuration for model selection
+# 'auto' or 'fixed'; an explicitly configured model path is used as is unless auto is requested
+WHISPER_MODEL_SELECTION = os.getenv('WHISPER_MODEL_SELECTION', 'fixed' if os.getenv('WHISPER_MODEL_PATH') else 'auto')
+WHISPER_MODELS_DIR = os.getenv('WHISPER_MODELS_DIR', os.path.dirname(WHISPER_MODEL_PATH))
+WHISPER_TARGET_RTF = float(os.getenv('WHISPER_TARGET_RTF', '0.5'))
+CALIBRATION_AUDIO = os.getenv('CALIBRATION_AUDIO', 'hello.m4a')
+
+# Configuration for the whisper-cli resource governor
+WHISPER_THREADS = int(os.getenv('WHISPER_THREADS', '0'))  # 0 = tune automatically
+WHISPER_RESERVED_CORES = int(os.getenv('WHISPER_RESERVED_CORES', '0'))
+WHISPER_MEMORY_RESERVE_MB = int(os.getenv('WHISPER_MEMORY_RESERVE_MB', '256'))
+WHISPER_MEMORY_OVERHEAD_MB = int(os.getenv('WHISPER_MEMORY_OVERHEAD_MB', '200'))
+WHISPER_NICE = int(os.getenv('WHISPER_NICE', '10'))
+WHISPER_CGROUP_MEMORY_MAX = os.getenv('WHISPER_CGROUP_MEMORY_MAX', '')  # e.g. 1500M, needs systemd-run
+
+# Configuration for online uploads
+ONLINE_AUDIO_BITRATE = os.getenv('ONLINE_AUDIO_BITRATE', '24k')
+ONLINE_TRIM_SILENCE = os.getenv('ONLINE_TRIM_SILENCE', 'false').lower() == 'true'
+ONLINE_MAX_UPLOAD_BYTES = int(os.getenv('ONLINE_MAX_UPLOAD_BYTES', str(25 * 1024 * 1024)))
+ONLINE_UPLOAD_CONCURRENCY = int(os.getenv('ONLINE_UPLOAD_CONCURRENCY', '3'))
+
 # Initialize OpenAI client lazily
 _openai_client = None
 
@@ -49,8 +114,228 @@ def check_online_availability():
     """Check if online transcription is available"""
     return bool(os.getenv('OPENAI_API_KEY'))
 
-def transcribe_offline(audio_file_path, language="en"):
-    """Transcribe audio using local whisper.cpp"""
+# Resource governor for whisper-cli
+def detect_cores():
+    """Number of CPU cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def available_memory_mb():
+    """Available memory in MB from /proc/meminfo, or None where unsupported"""
+    try:
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return None
+
+def governed_command(cmd):
+    """Wrap a whisper-cli command with nice/ionice and an optional systemd cgroup memory limit"""
+    if WHISPER_NICE and shutil.which('nice'):
+        cmd = ['nice', '-n', str(WHISPER_NICE)] + cmd
+    if shutil.which('ionice'):
+        cmd = ['ionice', '-c', '2', '-n', '7'] + cmd
+    if WHISPER_CGROUP_MEMORY_MAX and shutil.which('systemd-run'):
+        cmd = ['systemd-run', '--user', '--scope', '--quiet',
+               '-p', f'MemoryMax={WHISPER_CGROUP_MEMORY_MAX}', '-p', 'CPUWeight=50'] + cmd
+    return cmd
+
+class ResourceGovernor:
+    """Admission control and thread tuning for local whisper-cli processes.
+
+    A new process is admitted only when a core is free and enough memory is
+    available for the model (the first process is always admitted). Waiting
+    processes are admitted in scheduler order (priority class, then arrival).
+    A process running alone may use every free core; while other transcription
+    work is running or waiting, each may use at most its share of cores across
+    TRANSCRIPTION_WORKERS slots so one process cannot leave the others idle. Thread counts
+    come from the measured real-time factor (wall time / audio time) of each
+    candidate: every candidate is tried a few times, then the fastest is used
+    with occasional re-exploration to follow drift. Urgent processes (live
+    windows) go ahead of every waiter and may run on cores already in use.
+    """
+
+    MIN_SAMPLES = 3
+    EXPLORE_RATE = 0.1
+
+    def __init__(self):
+        self.cores = detect_cores()
+        self._condition = threading.Condition()
+        self._running = 0
+        self._threads_in_use = 0
+        self._waiting = []
+        self._sequence = 0
+        self._perf = None
+
+    def usable_cores(self):
+        return max(1, self.cores - WHISPER_RESERVED_CORES)
+
+    def thread_share(self):
+        """Most threads one process may use: all usable cores when nothing else needs them"""
+        with self._condition:
+            contended = self._running or self._waiting or scheduler.others_busy()
+        if not contended:
+            return self.usable_cores()
+        return max(1, self.usable_cores() // max(1, TRANSCRIPTION_WORKERS))
+
+    def model_memory_mb(self, model_path=None):
+        """Estimated resident memory of one whisper-cli process for a model (default: current)"""
+        try:
+            model_mb = os.path.getsize(model_path or WHISPER_MODEL_PATH) / (1024.0 * 1024.0)
+        except OSError:
+            model_mb = 150.0
+        return model_mb * 1.2 + WHISPER_MEMORY_OVERHEAD_MB
+
+    def _can_admit(self, model_path, threads=None, urgent=False):
+        if threads and self._threads_in_use + threads > self.usable_cores():
+            return False
+        if self._running == 0:
+            return True
+        if self._threads_in_use >= self.usable_cores() and not urgent:
+            return False
+        available = available_memory_mb()
+        return available is None or available - WHISPER_MEMORY_RESERVE_MB >= self.model_memory_mb(model_path)
+
+    def _load_perf(self):
+        if self._perf is None:
+            self._perf = {}
+            conn = init_db()
+            try:
+                rows = conn.execute("SELECT model, threads, audio_seconds, wall_seconds FROM whisper_perf ORDER BY id").fetchall()
+            finally:
+                conn.close()
+            for model, threads, audio_seconds, wall_seconds in rows:
+                self._update_perf(model, threads, wall_seconds / audio_seconds)
+        return self._perf
+
+    def _update_perf(self, model, threads, rtf):
+        runs, average = self._perf.get((model, threads), (0, rtf))
+        # Exponentially weighted so the estimate follows changes in the host over time
+        self._perf[(model, threads)] = (runs + 1, rtf if runs == 0 else 0.8 * average + 0.2 * rtf)
+
+    def choose_threads(self, free_cores, model_path=None):
+        """Pick a thread count for a new process given the cores not already in use"""
+        if WHISPER_THREADS:
+            return max(1, min(WHISPER_THREADS, free_cores))
+
+        candidates = sorted({n for n in (1, 2, 4, 8, free_cores) if n <= free_cores})
+        model = os.path.basename(model_path or WHISPER_MODEL_PATH)
+        perf = self._load_perf()
+        untried = [n for n in candidates if perf.get((model, n), (0, 0))[0] < self.MIN_SAMPLES]
+        if untried:
+            return untried[-1]
+        if random.random() < self.EXPLORE_RATE:
+            return random.choice(candidates)
+        return min(candidates, key=lambda n: perf[(model, n)][1])
+
+    @contextlib.contextmanager
+    def whisper_process(self, model_path=None, threads=None, urgent=False):
+        """Block until a whisper-cli process may start, yielding its thread count.
+
+        A fixed thread count (used for calibration) waits until that many cores are free.
+        An urgent process only waits for memory, so it never sits behind a long chunk.
+        """
+        waited = time.time()
+        if threads:
+            threads = min(threads, self.usable_cores())
+        ticket = scheduler.current_ticket()
+        with self._condition:
+            self._sequence += 1
+            # Urgent work goes first, scheduled jobs in their scheduler order, unscheduled work
+            # (calibration) last
+            key = ((-1, 0) if urgent else
+                   (PRIORITY_CLASSES[ticket['priority']], ticket['sequence']) if ticket else
+                   (len(PRIORITY_CLASSES), 0)) + (self._sequence,)
+            self._waiting.append(key)
+        while True:
+            with self._condition:
+                if min(self._waiting) == key and self._can_admit(model_path, threads, urgent):
+                    self._waiting.remove(key)
+                    break
+                # Memory is also freed by other processes, so re-check periodically
+                self._condition.wait(timeout=1.0)
+                if not ticket or not scheduler.should_yield(ticket):
+                    continue
+                self._waiting.remove(key)
+                self._condition.notify_all()
+            # Hand the scheduler slot to higher-priority work rather than hold it while blocked here
+            scheduler.yield_slot(ticket)
+            with self._condition:
+                self._waiting.append(key)
+        with self._condition:
+            if not threads:
+                free_cores = min(self.thread_share(), self.usable_cores() - self._threads_in_use)
+                if urgent:
+                    # Shares the busy cores with the running processes rather than squeeze onto one
+                    free_cores = self.thread_share()
+                threads = self.choose_threads(max(1, free_cores), model_path)
+            self._running += 1
+            self._threads_in_use += threads
+            self._condition.notify_all()
+        if time.time() - waited > 1:
+            logger.info(f"whisper-cli admitted after waiting {time.time() - waited:.1f}s for resources")
+        try:
+            yield threads
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._threads_in_use -= threads
+                self._condition.notify_all()
+
+    def record(self, threads, audio_seconds, wall_seconds, model_path=None):
+        """Record the real-time factor of a finished run"""
+        if audio_seconds < 10:
+            return  # model loading dominates very short clips
+        model = os.path.basename(model_path or WHISPER_MODEL_PATH)
+        rtf = wall_seconds / audio_seconds
+        with self._condition:
+            self._load_perf()
+            self._update_perf(model, threads, rtf)
+        logger.info(f"whisper-cli real-time factor {rtf:.2f} with {threads} thread(s) on {model}")
+
+        conn = init_db()
+        try:
+            with conn:
+                conn.execute("INSERT INTO whisper_perf (model, threads, audio_seconds, wall_seconds) VALUES (?, ?, ?, ?)",
+                             (model, threads, audio_seconds, wall_seconds))
+        finally:
+            conn.close()
+
+    def stats(self):
+        """Current resources and measured real-time factors"""
+        with self._condition:
+            perf = self._load_perf()
+            model = os.path.basename(WHISPER_MODEL_PATH)
+            measured = {threads: {'runs': runs, 'rtf': round(rtf, 3)}
+                        for (name, threads), (runs, rtf) in sorted(perf.items()) if name == model}
+            available = available_memory_mb()
+            return {
+                'cores': self.cores,
+                'usable_cores': self.usable_cores(),
+                'thread_share': self.thread_share(),
+                'waiting_processes': len(self._waiting),
+                'running_processes': self._running,
+                'threads_in_use': self._threads_in_use,
+                'memory_available_mb': round(available) if available is not None else None,
+                'model_memory_mb': round(self.model_memory_mb()),
+                'thread_rtf': measured,
+                'preferred_threads': min(measured, key=lambda n: measured[n]['rtf']) if measured else None
+            }
+
+governor = ResourceGovernor()
+
+def transcribe_offline(audio_file_path, language="en", return_segments=False, model_path=None, threads=None,
+                       urgent=False):
+    """Transcribe audio using local whisper.cpp (the selected model unless model_path is given;
+    the governor picks the thread count unless threads is given; urgent skips the wait for cores)
+
+    With return_segments=True returns (transcription, segments) where segments
+    is a list of {'start', 'end', 'text'} dicts with times in seconds.
+    """
     try:
         logger.info(f"OFFLINE MODE: Using local whisper.cpp for transcription")
         
@@ -81,21 +366,31 @@ def transcribe_offline(audio_file_path, language="en"):
                 logger.warning(f"ffmpeg not available or conversion failed: {str(e)}")
                 raise Exception(f"Unsupported format {file_ext} and no ffmpeg available for conversion")
         
-        # Prepare whisper-cli command (updated syntax)
-        cmd = [
-            WHISPER_CPP_PATH,
-            '-m', WHISPER_MODEL_PATH,
-            '-f', working_file,
-            '-l', language,
-            '-t', '4',  # Use 4 threads
-            '--output-txt',  # Output text format
-            '--no-prints'    # Suppress verbose output
-        ]
-        
-        logger.info(f"Running whisper-cli: {' '.join(cmd)}")
-        
-        # Run whisper-cli
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        audio_seconds = get_audio_duration(working_file)
+        model_path = model_path or WHISPER_MODEL_PATH
+
+        # Wait for the governor to admit a new whisper process and pick its thread count
+        with governor.whisper_process(model_path, threads, urgent) as threads:
+            # Prepare whisper-cli command (updated syntax)
+            cmd = [
+                WHISPER_CPP_PATH,
+                '-m', model_path,
+                '-f', working_file,
+                '-l', language,
+                '-t', str(threads),
+                '--output-txt',  # Output text format
+                '--output-json', # Output timestamped segments
+                '--no-prints'    # Suppress verbose output
+            ]
+            
+            logger.info(f"Running whisper-cli: {' '.join(cmd)}")
+            
+            # Run whisper-cli at low CPU/IO priority so the web UI stays responsive
+            started = time.time()
+            result = subprocess.run(governed_command(cmd), capture_output=True, text=True, timeout=300)
+            # Urgent runs share busy cores, so their timing says nothing about the thread count
+            if result.returncode == 0 and audio_seconds and not urgent:
+                governor.record(threads, audio_seconds, time.time() - started, model_path)
         
         if result.returncode != 0:
             raise Exception(f"Whisper-cli failed: {result.stderr}")
@@ -108,12 +403,28 @@ def transcribe_offline(audio_file_path, language="en"):
             
             # Clean up the output file
             os.remove(output_txt)
+
+            segments = []
+            output_json = working_file + '.json'
+            if os.path.exists(output_json):
+                with open(output_json, 'r', encoding='utf-8') as f:
+                    for entry in json.load(f).get('transcription', []):
+                        text = entry.get('text', '').strip()
+                        if text:
+                            segments.append({
+                                'start': entry['offsets']['from'] / 1000.0,
+                                'end': entry['offsets']['to'] / 1000.0,
+                                'text': text
+                            })
+                os.remove(output_json)
             
             # Clean up converted file if it was created
             if converted_file and os.path.exists(converted_file):
                 os.remove(converted_file)
             
             logger.info(f"Offline transcription completed: {transcription[:100]}...")
+            if return_segments:
+                return transcription, segments
             return transcription
         else:
             raise Exception("Whisper-cli output file not found")
@@ -130,33 +441,206 @@ def transcribe_offline(audio_file_path, language="en"):
         logger.error(f"Offline transcription failed: {str(e)}")
         raise
 
-def transcribe_online(audio_file_path, language="en"):
-    """Transcribe audio using OpenAI Whisper API"""
+# Per-job transfer metrics (jobs run on the requesting thread) and process-wide totals
+_job_metrics = threading.local()
+_online_totals = {'requests': 0, 'original_bytes': 0, 'upload_bytes': 0, 'latency_seconds': 0.0}
+_online_totals_lock = threading.Lock()
+
+def start_job_metrics():
+    """Begin collecting online transfer metrics for the job on this thread"""
+    _job_metrics.current = {'online_requests': 0, 'original_bytes': 0, 'upload_bytes': 0, 'request_latency_ms': []}
+    return _job_metrics.current
+
+def record_online_transfer(original_bytes, requests):
+    """Record one online transcription: source size and (upload_bytes, latency) per request"""
+    upload_bytes = sum(size for size, _ in requests)
+    latency = sum(seconds for _, seconds in requests)
+    logger.info(f"Online upload: {original_bytes} -> {upload_bytes} bytes in {len(requests)} request(s), "
+                f"{latency:.1f}s total request time")
+
+    metrics = getattr(_job_metrics, 'current', None)
+    if metrics is not None:
+        metrics['online_requests'] += len(requests)
+        metrics['original_bytes'] += original_bytes
+        metrics['upload_bytes'] += upload_bytes
+        metrics['request_latency_ms'].extend(int(seconds * 1000) for _, seconds in requests)
+    with _online_totals_lock:
+        _online_totals['requests'] += len(requests)
+        _online_totals['original_bytes'] += original_bytes
+        _online_totals['upload_bytes'] += upload_bytes
+        _online_totals['latency_seconds'] += latency
+
+def online_upload_stats():
+    """Process-wide online upload totals"""
+    with _online_totals_lock:
+        totals = dict(_online_totals)
+    return {
+        'requests': totals['requests'],
+        'original_bytes': totals['original_bytes'],
+        'upload_bytes': totals['upload_bytes'],
+        'compression_ratio': round(totals['upload_bytes'] / totals['original_bytes'], 3) if totals['original_bytes'] else None,
+        'avg_request_latency_ms': int(1000 * totals['latency_seconds'] / totals['requests']) if totals['requests'] else None
+    }
+
+def _encode_for_upload(audio_file_path, output_base, start=None, duration=None):
+    """Transcode (part of) a file to low-bitrate 16 kHz mono Opus, falling back to MP3"""
+    cmd = ['ffmpeg', '-v', 'error']
+    if start is not None:
+        cmd += ['-ss', f"{start:.3f}"]
+    if duration is not None:
+        cmd += ['-t', f"{duration:.3f}"]
+    cmd += ['-i', audio_file_path, '-vn', '-ac', '1', '-ar', '16000']
+    if ONLINE_TRIM_SILENCE:
+        cmd += ['-af', 'silenceremove=stop_periods=-1:stop_duration=1:stop_threshold=-45dB']
+
+    for codec_args, extension in (
+            (['-c:a', 'libopus', '-b:a', ONLINE_AUDIO_BITRATE, '-application', 'voip'], '.ogg'),
+            (['-c:a', 'libmp3lame', '-b:a', ONLINE_AUDIO_BITRATE], '.mp3')):
+        output_path = output_base + extension
+        result = subprocess.run(cmd + codec_args + ['-y', output_path], capture_output=True, text=True, timeout=300)
+        if result.returncode == 0:
+            return output_path
+        logger.warning(f"Encoding with {codec_args[1]} failed: {result.stderr.strip()[:200]}")
+    raise Exception("Could not encode audio for upload")
+
+def _speech_boundaries(audio_file_path):
+    """Midpoints (seconds) of silences long enough to split on"""
+    result = subprocess.run([
+        'ffmpeg', '-v', 'info', '-i', audio_file_path, '-af', 'silencedetect=noise=-35dB:d=0.4', '-f', 'null', '-'
+    ], capture_output=True, text=True, timeout=300)
+    starts = [float(v) for v in re.findall(r'silence_start: ([\d.]+)', result.stderr)]
+    ends = [float(v) for v in re.findall(r'silence_end: ([\d.]+)', result.stderr)]
+    return [(silence_start + silence_end) / 2 for silence_start, silence_end in zip(starts, ends)]
+
+def prepare_online_upload(audio_file_path, work_dir):
+    """Compress audio for the Whisper API, splitting at speech boundaries if over the size limit.
+
+    Returns a list of (part_path, offset_seconds) in playback order.
+    """
+    if not shutil.which('ffmpeg'):
+        return [(audio_file_path, 0.0)]
+
+    original_size = os.path.getsize(audio_file_path)
+    try:
+        encoded = _encode_for_upload(audio_file_path, os.path.join(work_dir, 'upload'))
+    except Exception as e:
+        logger.warning(f"Pre-upload compression skipped: {str(e)}")
+        return [(audio_file_path, 0.0)]
+
+    encoded_size = os.path.getsize(encoded)
+    if encoded_size <= ONLINE_MAX_UPLOAD_BYTES:
+        if encoded_size >= original_size and original_size <= ONLINE_MAX_UPLOAD_BYTES:
+            return [(audio_file_path, 0.0)]
+        return [(encoded, 0.0)]
+
+    # Parts are cut from the original, so its timeline sets the cuts; a trimmed encode is shorter
+    duration = get_audio_duration(audio_file_path) or (None if ONLINE_TRIM_SILENCE else get_audio_duration(encoded))
+    if not duration:
+        raise Exception("Audio exceeds the upload limit and its duration is unknown, cannot split")
+
+    # Aim for parts at ~90% of the limit, cut at the silence nearest each target
+    part_count = int(encoded_size / (ONLINE_MAX_UPLOAD_BYTES * 0.9)) + 1
+    boundaries = _speech_boundaries(audio_file_path)
+    cuts = []
+    for k in range(1, part_count):
+        target = duration * k / part_count
+        nearby = [b for b in boundaries if abs(b - target) <= 60 and (not cuts or b > cuts[-1])]
+        cuts.append(min(nearby, key=lambda b: abs(b - target)) if nearby else target)
+
+    edges = [0.0] + cuts + [duration]
+    parts = []
+    for index in range(len(edges) - 1):
+        # The last part runs to the end of the file even if the probed duration is short
+        length = edges[index + 1] - edges[index] if index < len(edges) - 2 else None
+        part_path = _encode_for_upload(audio_file_path, os.path.join(work_dir, f"part_{index}"),
+                                       edges[index], length)
+        parts.append((part_path, edges[index]))
+    logger.info(f"Split {encoded_size} byte upload into {len(parts)} parts at speech boundaries")
+    return parts
+
+def _transcribe_online_part(part_path, language, return_segments):
+    """Send one file to the Whisper API, returning (transcription, segments, bytes, latency)"""
+    client = get_openai_client()
+    upload_bytes = os.path.getsize(part_path)
+    started = time.time()
+    with open(part_path, 'rb') as audio_file:
+        transcription_response = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio_file,
+            language=language,
+            prompt="Mixed conversation with Tamil and English words",
+            response_format="verbose_json" if return_segments else "text"
+        )
+    latency = time.time() - started
+
+    if not return_segments:
+        return transcription_response.strip(), [], upload_bytes, latency
+
+    segments = []
+    for segment in getattr(transcription_response, 'segments', None) or []:
+        if not isinstance(segment, dict):
+            segment = segment.model_dump()
+        if segment.get('text', '').strip():
+            segments.append({
+                'start': float(segment['start']),
+                'end': float(segment['end']),
+                'text': segment['text'].strip()
+            })
+    return transcription_response.text.strip(), segments, upload_bytes, latency
+
+def transcribe_online(audio_file_path, language="en", return_segments=False):
+    """Transcribe audio using OpenAI Whisper API
+
+    Audio is compressed before upload and split into concurrently sent parts
+    when it would exceed the API size limit.
+    With return_segments=True returns (transcription, segments) like transcribe_offline.
+    """
+    work_dir = tempfile.mkdtemp(prefix='online_')
     try:
         logger.info("ONLINE MODE: Using OpenAI Whisper API for transcription")
-        
-        client = get_openai_client()
-        with open(audio_file_path, 'rb') as audio_file:
-            logger.info("ENGLISH-DIRECT TRANSCRIPTION: Using English model for Tamil-English mixed speech")
-            
-            transcription_response = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language=language,
-                prompt="Mixed conversation with Tamil and English words",
-                response_format="text"
-            )
-            
-            transcription = transcription_response.strip()
-            logger.info(f"Online transcription completed: {transcription[:100]}...")
-            return transcription
+        logger.info("ENGLISH-DIRECT TRANSCRIPTION: Using English model for Tamil-English mixed speech")
+
+        parts = prepare_online_upload(audio_file_path, work_dir)
+        if len(parts) == 1:
+            results = [_transcribe_online_part(parts[0][0], language, return_segments)]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=ONLINE_UPLOAD_CONCURRENCY) as executor:
+                results = list(executor.map(
+                    lambda part: _transcribe_online_part(part[0], language, return_segments), parts))
+
+        texts, segments = [], []
+        for (_, offset), (text, part_segments, _, _) in zip(parts, results):
+            texts.append(text)
+            for segment in part_segments:
+                segment['start'] += offset
+                segment['end'] += offset
+                segments.append(segment)
+        record_online_transfer(os.path.getsize(audio_file_path),
+                               [(upload_bytes, latency) for _, _, upload_bytes, latency in results])
+
+        transcription = '\n'.join(text for text in texts if text)
+        logger.info(f"Online transcription completed: {transcription[:100]}...")
+
+        if ONLINE_TRIM_SILENCE:
+            # Timestamps refer to the trimmed audio and cannot be aligned with the original
+            segments = []
+        if return_segments:
+            return transcription, segments
+        return transcription
             
     except Exception as e:
         logger.error(f"Online transcription failed: {str(e)}")
         raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
 
-def transcribe_audio(audio_file_path, language="en"):
-    """Main transcription function with mode selection and fallback"""
+def transcribe_audio(audio_file_path, language="en", return_segments=False):
+    """Main transcription function with mode selection and fallback
+
+    Returns (transcription, mode), or ((transcription, segments), mode) when
+    return_segments=True.
+    """
     offline_available = check_offline_availability()
     online_available = check_online_availability()
     
@@ -166,24 +650,24 @@ def transcribe_audio(audio_file_path, language="en"):
     if TRANSCRIPTION_MODE == 'offline':
         if not offline_available:
             raise Exception("Offline mode requested but whisper.cpp not available")
-        return transcribe_offline(audio_file_path, language), "offline"
+        return transcribe_offline(audio_file_path, language, return_segments), "offline"
         
     elif TRANSCRIPTION_MODE == 'online':
         if not online_available:
             raise Exception("Online mode requested but OpenAI API key not available")
-        return transcribe_online(audio_file_path, language), "online"
+        return transcribe_online(audio_file_path, language, return_segments), "online"
         
     elif TRANSCRIPTION_MODE == 'hybrid':
         # Try offline first, fallback to online
         if offline_available:
             try:
-                return transcribe_offline(audio_file_path, language), "offline"
+                return transcribe_offline(audio_file_path, language, return_segments), "offline"
             except Exception as e:
                 logger.warning(f"Offline transcription failed, trying online: {str(e)}")
                 
         if online_available:
             try:
-                return transcribe_online(audio_file_path, language), "online"
+                return transcribe_online(audio_file_path, language, return_segments), "online"
             except Exception as e:
                 logger.error(f"Online transcription also failed: {str(e)}")
                 raise Exception("Both offline and online transcription failed")
@@ -194,8 +678,22 @@ def transcribe_audio(audio_file_path, language="en"):
         raise Exception(f"Invalid transcription mode: {TRANSCRIPTION_MODE}")
 
 # Database setup for saving results
+_db_initialized = False
+_db_init_lock = threading.Lock()
+
 def init_db():
+    """Open the database, creating the schema on first use in this process"""
+    global _db_initialized
     conn = sqlite3.connect('transcriptions.db')
+    if _db_initialized:
+        return conn
+    with _db_init_lock:
+        if not _db_initialized:
+            _create_schema(conn)
+            _db_initialized = True
+    return conn
+
+def _create_schema(conn):
     c = conn.cursor()
     c.execute('''CREATE TABLE IF NOT EXISTS transcriptions
                  (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -204,8 +702,115 @@ def init_db():
                   summary TEXT,
                   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                   file_size INTEGER)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS segments
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  transcription_id INTEGER,
+                  idx INTEGER,
+                  start_time REAL,
+                  end_time REAL,
+                  text TEXT,
+                  speaker TEXT)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_segments_transcription
+                 ON segments (transcription_id, idx)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS fingerprint_frames
+                 (transcription_id INTEGER PRIMARY KEY,
+                  frame_count INTEGER,
+                  frames BLOB,
+                  active BLOB)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS fingerprint_anchors
+                 (transcription_id INTEGER,
+                  frame INTEGER,
+                  hash INTEGER)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_fingerprint_anchors_hash
+                 ON fingerprint_anchors (hash)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_fingerprint_anchors_transcription
+                 ON fingerprint_anchors (transcription_id)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS whisper_perf
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  model TEXT,
+                  threads INTEGER,
+                  audio_seconds REAL,
+                  wall_seconds REAL,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS model_benchmarks
+                 (host TEXT,
+                  model TEXT,
+                  threads INTEGER,
+                  rtf REAL,
+                  wall_seconds REAL,
+                  audio_seconds REAL,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                  PRIMARY KEY (host, model))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS transcription_jobs
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  filename TEXT,
+                  upload_path TEXT,
+                  file_size INTEGER,
+                  language TEXT,
+                  priority TEXT,
+                  user TEXT,
+                  status TEXT,
+                  duration REAL,
+                  total_chunks INTEGER,
+                  done_chunks INTEGER DEFAULT 0,
+                  error TEXT,
+                  transcription_id INTEGER,
+                  batch_id TEXT,
+                  original_name TEXT,
+                  transcription_mode TEXT,
+                  upload_metrics TEXT,
+                  transcription TEXT,
+                  segments TEXT,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_transcription_jobs_batch
+                 ON transcription_jobs (batch_id)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS transcription_batches
+                 (id TEXT PRIMARY KEY,
+                  status TEXT,
+                  priority TEXT,
+                  user TEXT,
+                  error TEXT,
+                  created_at REAL,
+                  started_at REAL,
+                  finished_at REAL)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS job_chunks
+                 (job_id INTEGER,
+                  idx INTEGER,
+                  start_time REAL,
+                  end_time REAL,
+                  text TEXT,
+                  segments TEXT,
+                  mode TEXT,
+                  PRIMARY KEY (job_id, idx))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS speaker_embeddings
+                 (audio_hash TEXT PRIMARY KEY,
+                  turns TEXT,
+                  embeddings TEXT,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
     conn.commit()
-    return conn
+
+# Cached counters so health probes never scan the database
+_counters = {'total_transcriptions': None}
+_counters_lock = threading.Lock()
+
+def load_counters():
+    """Count stored transcriptions once and cache the result"""
+    conn = init_db()
+    try:
+        total = conn.execute("SELECT COUNT(*) FROM transcriptions").fetchone()[0]
+    finally:
+        conn.close()
+    with _counters_lock:
+        if _counters['total_transcriptions'] is None:
+            _counters['total_transcriptions'] = total
+    return _counters['total_transcriptions']
+
+def count_transcriptions(added):
+    """Add newly committed transcriptions to the cached counter"""
+    with _counters_lock:
+        if _counters['total_transcriptions'] is not None:
+            _counters['total_transcriptions'] += added
 
 def clean_transcription_artifacts(transcription):
     """Remove transcription artifacts and repetitive content"""
@@ -246,9 +851,1364 @@ def clean_transcription_artifacts(transcription):
     
     return result
 
+def format_transcription(transcription):
+    """Format transcription with bullet points and apply post-processing cleanup"""
+    if not transcription or len(transcription.strip()) == 0:
+        return transcription
+
+    sentences = []
+    current_sentence = ""
+    
+    for char in transcription:
+        current_sentence += char
+        if char in '.!?' or (char == '\n' and current_sentence.strip()):
+            if current_sentence.strip():
+                sentences.append(current_sentence.strip())
+                current_sentence = ""
+    
+    if current_sentence.strip():
+        sentences.append(current_sentence.strip())
+    
+    if len(sentences) > 1:
+        formatted_sentences = []
+        for sentence in sentences:
+            if sentence.strip():
+                formatted_sentences.append(f"• {sentence.strip()}")
+        transcription = "\n".join(formatted_sentences)
+    
+    # Apply post-processing cleanup
+    logger.info("Applying post-processing cleanup...")
+    transcription = clean_transcription_artifacts(transcription)
+    logger.info(f"Cleaned transcription: {transcription[:100]}...")
+    return transcription
+
+def save_transcription_file(transcription_id, transcription):
+    """Write transcription text to the Results directory"""
+    transcription_file = f"Results/transcription_{transcription_id}.txt"
+    with open(transcription_file, 'w', encoding='utf-8') as f:
+        f.write(transcription)
+    return transcription_file
+
+def insert_transcription(cursor, filename, transcription, file_size, segments=None, fingerprint=None):
+    """Insert a transcription row, its segments and audio fingerprint using an open cursor"""
+    cursor.execute('''
+        INSERT INTO transcriptions (filename, transcription, created_at, file_size)
+        VALUES (?, ?, datetime('now'), ?)
+    ''', (filename, transcription, file_size))
+    transcription_id = cursor.lastrowid
+    _insert_segments(cursor, transcription_id, segments)
+    save_fingerprint(cursor, transcription_id, fingerprint)
+    return transcription_id
+
+def update_transcription(cursor, transcription_id, filename, transcription, file_size, segments=None, fingerprint=None):
+    """Replace a stored transcription in place and invalidate its summary"""
+    cursor.execute('''
+        UPDATE transcriptions SET filename = ?, transcription = ?, file_size = ?, summary = NULL
+        WHERE id = ?
+    ''', (filename, transcription, file_size, transcription_id))
+    cursor.execute("DELETE FROM segments WHERE transcription_id = ?", (transcription_id,))
+    _insert_segments(cursor, transcription_id, segments)
+    save_fingerprint(cursor, transcription_id, fingerprint)
+
+def _insert_segments(cursor, transcription_id, segments):
+    if segments:
+        cursor.executemany('''
+            INSERT INTO segments (transcription_id, idx, start_time, end_time, text, speaker)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(transcription_id, idx, segment['start'], segment['end'], segment['text'], segment.get('speaker'))
+              for idx, segment in enumerate(segments)])
+
+def store_transcription(filename, transcription, file_size, segments=None, fingerprint=None, job_id=None):
+    """Insert a transcription row and write its result file, returning the new id.
+
+    With a job_id the job is marked completed in the same transaction, so a
+    crash can never leave a stored transcription with a resumable job.
+    """
+    conn = init_db()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            transcription_id = insert_transcription(cursor, filename, transcription, file_size, segments, fingerprint)
+            if job_id:
+                mark_job_completed(cursor, job_id, transcription_id)
+    finally:
+        conn.close()
+    count_transcriptions(1)
+    
+    save_transcription_file(transcription_id, transcription)
+    return transcription_id
+
+def get_audio_duration(audio_file_path):
+    """Return audio duration in seconds, or None if it cannot be determined"""
+    try:
+        result = subprocess.run([
+            'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1', audio_file_path
+        ], capture_output=True, text=True, timeout=30)
+        if result.returncode == 0 and result.stdout.strip():
+            return float(result.stdout.strip())
+    except (subprocess.TimeoutExpired, FileNotFoundError, ValueError):
+        pass
+
+    # Fall back to the WAV header when ffprobe is not installed
+    try:
+        with wave.open(audio_file_path, 'rb') as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate())
+    except Exception:
+        return None
+
+def file_sha256(file_path):
+    """Return the SHA-256 hex digest of a file"""
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def stream_pcm(audio_file_path, sample_rate=16000, block_seconds=30):
+    """Yield 16-bit mono PCM in blocks of block_seconds (the last may be shorter) without decoding it all at once"""
+    block_bytes = int(block_seconds * sample_rate) * 2
+    try:
+        with wave.open(audio_file_path, 'rb') as wav_file:
+            if (wav_file.getnchannels() == 1 and wav_file.getsampwidth() == 2 and
+                    wav_file.getframerate() == sample_rate):
+                for block in iter(lambda: wav_file.readframes(block_bytes // 2), b''):
+                    yield block
+                return
+    except (wave.Error, EOFError):
+        pass
+
+    try:
+        process = subprocess.Popen([
+            'ffmpeg', '-v', 'error', '-i', audio_file_path,
+            '-f', 's16le', '-ac', '1', '-ar', str(sample_rate), '-'
+        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError as e:
+        raise Exception(f"Cannot decode audio without ffmpeg: {str(e)}")
+    try:
+        while True:
+            block = process.stdout.read(block_bytes)
+            if not block:
+                break
+            yield block
+        if process.wait(timeout=300) != 0:
+            raise Exception(f"Audio decoding failed: {process.stderr.read().decode(errors='replace')}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+# Speaker diarization
+_diarization_executor = None
+_mel_filterbank = None
+
+def _frame_energy(np, audio_file_path, sample_rate, frame):
+    """Log energy (dB) of consecutive frames, computed block by block"""
+    energies = []
+    for block in stream_pcm(audio_file_path, sample_rate):
+        samples = np.frombuffer(block, dtype=np.int16).astype(np.float32) / 32768.0
+        count = len(samples) // frame
+        frames = samples[:count * frame].reshape(count, frame)
+        energies.append(10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10))
+    return np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+
+def _speech_regions(np, energy, frame):
+    """Energy-based VAD over 30 ms frames returning (start, end) sample ranges of at most 3 seconds"""
+    count = len(energy)
+    if count == 0:
+        return []
+    noise_floor = np.percentile(energy, 5)
+    threshold = noise_floor + min(12, (energy.max() - noise_floor) / 2)
+    speech = energy > threshold
+
+    # Bridge pauses shorter than 0.3s and drop bursts shorter than 0.5s
+    regions = []
+    start = None
+    gap = 0
+    for i, is_speech in enumerate(speech):
+        if is_speech:
+            if start is None:
+                start = i
+            gap = 0
+        elif start is not None:
+            gap += 1
+            if gap > 10:
+                regions.append((start, i - gap + 1))
+                start = None
+                gap = 0
+    if start is not None:
+        regions.append((start, count - gap))
+
+    subsegments = []
+    max_frames = 100
+    for start, end in regions:
+        if end - start < 17:
+            continue
+        while end - start > max_frames + 25:
+            subsegments.append((start * frame, (start + max_frames) * frame))
+            start += max_frames
+        subsegments.append((start * frame, end * frame))
+    return subsegments
+
+def _speaker_embedding(np, samples, sample_rate):
+    """Summarise a speech segment as mean/std of MFCCs (a lightweight CPU speaker embedding)"""
+    global _mel_filterbank
+    frame_len, hop, n_fft, n_mels = int(0.025 * sample_rate), int(0.01 * sample_rate), 512, 40
+    if _mel_filterbank is None:
+        mel_points = np.linspace(0, 2595 * np.log10(1 + (sample_rate / 2) / 700.0), n_mels + 2)
+        bins = np.floor((n_fft + 1) * 700 * (10 ** (mel_points / 2595) - 1) / sample_rate).astype(int)
+        filterbank = np.zeros((n_mels, n_fft // 2 + 1))
+        for m in range(1, n_mels + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            filterbank[m - 1, left:center] = (np.arange(left, center) - left) / max(center - left, 1)
+            filterbank[m - 1, center:right] = (right - np.arange(center, right)) / max(right - center, 1)
+        dct = np.cos(np.pi / n_mels * (np.arange(n_mels) + 0.5)[None, :] * np.arange(1, 20)[:, None])
+        _mel_filterbank = (filterbank, dct)
+
+    filterbank, dct = _mel_filterbank
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame_len)[::hop] * np.hamming(frame_len)
+    power = np.abs(np.fft.rfft(frames, n=n_fft)) ** 2
+    cepstra = np.log(power @ filterbank.T + 1e-10) @ dct.T
+    return np.concatenate([cepstra.mean(axis=0), cepstra.std(axis=0)])
+
+def _region_embeddings(np, audio_file_path, regions, sample_rate):
+    """Speaker embeddings for sorted sample ranges, holding only the audio still needed in memory"""
+    embeddings = []
+    buffer = np.zeros(0, dtype=np.float32)
+    buffer_start = 0
+    for block in stream_pcm(audio_file_path, sample_rate):
+        buffer = np.concatenate([buffer, np.frombuffer(block, dtype=np.int16).astype(np.float32) / 32768.0])
+        while len(embeddings) < len(regions) and regions[len(embeddings)][1] <= buffer_start + len(buffer):
+            start, end = regions[len(embeddings)]
+            embeddings.append(_speaker_embedding(np, buffer[start - buffer_start:end - buffer_start], sample_rate))
+        if len(embeddings) == len(regions):
+            break
+        keep_from = min(max(buffer_start, regions[len(embeddings)][0]), buffer_start + len(buffer))
+        buffer = buffer[keep_from - buffer_start:]
+        buffer_start = keep_from
+    return embeddings
+
+def _cluster_embeddings(np, embeddings):
+    """Agglomerative clustering on cosine similarity of cluster centroids"""
+    count = len(embeddings)
+    labels = list(range(count))
+    if count < 2:
+        return labels
+
+    centroids = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    sums = centroids.copy()
+    similarity = centroids @ centroids.T
+    np.fill_diagonal(similarity, -np.inf)
+    active = count
+
+    while active > 1:
+        i, j = np.unravel_index(np.argmax(similarity), similarity.shape)
+        if similarity[i, j] < DIARIZATION_THRESHOLD and active <= DIARIZATION_MAX_SPEAKERS:
+            break
+        # Merge cluster j into cluster i and refresh i's similarities
+        sums[i] += sums[j]
+        labels = [i if label == j else label for label in labels]
+        similarity[j, :] = -np.inf
+        similarity[:, j] = -np.inf
+        centroid = sums[i] / np.linalg.norm(sums[i])
+        row = (sums / np.linalg.norm(sums, axis=1, keepdims=True)) @ centroid
+        row[np.isinf(similarity[:, i]) & (np.arange(count) != i)] = -np.inf
+        row[i] = -np.inf
+        similarity[i, :] = row
+        similarity[:, i] = row
+        active -= 1
+    return labels
+
+def diarize_audio(audio_file_path):
+    """Return speaker turns [{'start', 'end', 'speaker'}] for an audio file, cached per audio hash"""
+    audio_hash = file_sha256(audio_file_path)
+    conn = init_db()
+    try:
+        row = conn.execute("SELECT turns FROM speaker_embeddings WHERE audio_hash = ?", (audio_hash,)).fetchone()
+    finally:
+        conn.close()
+    if row:
+        logger.info(f"Using cached speaker embeddings for {audio_hash[:12]}")
+        return json.loads(row[0])
+
+    try:
+        import numpy as np
+    except ImportError:
+        logger.warning("Diarization skipped: numpy is not installed")
+        return []
+
+    started = time.time()
+    sample_rate = 16000
+    # Two streamed passes (VAD, then embeddings) keep memory flat however long the recording is
+    frame = int(0.03 * sample_rate)
+    regions = _speech_regions(np, _frame_energy(np, audio_file_path, sample_rate, frame), frame)
+    embeddings = _region_embeddings(np, audio_file_path, regions, sample_rate)
+    regions = regions[:len(embeddings)]
+    if not regions:
+        return []
+
+    embeddings = np.array(embeddings)
+    # Normalise across the recording so channel characteristics do not dominate
+    embeddings = (embeddings - embeddings.mean(axis=0)) / (embeddings.std(axis=0) + 1e-6)
+    labels = _cluster_embeddings(np, embeddings)
+
+    # Fold clusters with under 3s of speech into the closest substantial speaker
+    durations = {}
+    for (start, end), label in zip(regions, labels):
+        durations[label] = durations.get(label, 0) + (end - start) / sample_rate
+    major = [label for label, seconds in durations.items() if seconds >= 3]
+    if major and len(major) < len(durations):
+        unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        centroids = {label: unit[[i for i, l in enumerate(labels) if l == label]].mean(axis=0) for label in major}
+        labels = [label if label in centroids else max(major, key=lambda m: float(unit[i] @ centroids[m]))
+                  for i, label in enumerate(labels)]
+
+    # Number speakers by order of first appearance
+    speaker_names = {}
+    turns = []
+    for (start, end), label in zip(regions, labels):
+        speaker = speaker_names.setdefault(label, f"Speaker {len(speaker_names) + 1}")
+        if turns and turns[-1]['speaker'] == speaker and start / sample_rate - turns[-1]['end'] < 0.5:
+            turns[-1]['end'] = end / sample_rate
+        else:
+            turns.append({'start': start / sample_rate, 'end': end / sample_rate, 'speaker': speaker})
+
+    conn = init_db()
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO speaker_embeddings (audio_hash, turns, embeddings) VALUES (?, ?, ?)",
+                         (audio_hash, json.dumps(turns), json.dumps(np.round(embeddings, 4).tolist())))
+    finally:
+        conn.close()
+
+    logger.info(f"Diarization found {len(speaker_names)} speaker(s) in {time.time() - started:.1f}s")
+    return turns
+
+def start_diarization(audio_file_path):
+    """Start diarization in the background if enabled, returning a future or None"""
+    global _diarization_executor
+    if not DIARIZATION_ENABLED:
+        return None
+    if _diarization_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _diarization_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='diarization')
+    return _diarization_executor.submit(diarize_audio, audio_file_path)
+
+def attach_speakers(segments, diarization):
+    """Label transcript segments with the speaker whose turns overlap them most"""
+    if diarization is None or not segments:
+        return segments
+    try:
+        turns = diarization.result()
+    except Exception as e:
+        logger.warning(f"Diarization failed, keeping unlabelled segments: {str(e)}")
+        return segments
+
+    for segment in segments:
+        overlap = {}
+        for turn in turns:
+            shared = min(segment['end'], turn['end']) - max(segment['start'], turn['start'])
+            if shared > 0:
+                overlap[turn['speaker']] = overlap.get(turn['speaker'], 0) + shared
+        segment['speaker'] = max(overlap, key=overlap.get) if overlap else None
+    return segments
+
+def load_speaker_transcript(transcription_id):
+    """Build a 'Speaker N: text' transcript from stored segments, or None if unlabelled"""
+    conn = init_db()
+    try:
+        rows = conn.execute("SELECT speaker, text FROM segments WHERE transcription_id = ? ORDER BY idx",
+                            (transcription_id,)).fetchall()
+    finally:
+        conn.close()
+    if not rows or not any(speaker for speaker, _ in rows):
+        return None
+
+    lines = []
+    for speaker, text in rows:
+        speaker = speaker or 'Speaker'
+        if lines and lines[-1][0] == speaker:
+            lines[-1][1].append(text)
+        else:
+            lines.append((speaker, [text]))
+    return '\n'.join(f"{speaker}: {' '.join(texts)}" for speaker, texts in lines)
+
+# Transcription job scheduling
+class TranscriptionScheduler:
+    """Priority admission gate for transcription work.
+
+    At most `slots` jobs transcribe at once. Waiting jobs are admitted by
+    priority class, then by how many jobs their user already has running,
+    then shortest expected audio first (bulk jobs go longest first so a
+    batch finishes sooner). Long jobs call yield_slot() between chunks so
+    waiting higher-priority work can take over.
+    """
+
+    def __init__(self, slots):
+        self.slots = max(1, slots)
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._active = 0
+        self._running_by_user = {}
+        self._sequence = 0
+        self._local = threading.local()
+        self._stats = {name: {'admitted': 0, 'total_wait': 0.0, 'max_wait': 0.0, 'preemptions': 0}
+                       for name in PRIORITY_CLASSES}
+
+    def _order(self, ticket):
+        duration = ticket['duration'] or 0.0
+        return (PRIORITY_CLASSES[ticket['priority']],
+                self._running_by_user.get(ticket['user'], 0),
+                -duration if ticket['priority'] == 'bulk' else duration,
+                ticket['sequence'])
+
+    def _acquire(self, ticket):
+        # Every admission is recorded, including re-admission after yielding the slot
+        enqueued_at = time.time()
+        with self._condition:
+            self._waiting.append(ticket)
+            while self._active >= self.slots or min(self._waiting, key=self._order) is not ticket:
+                self._condition.wait()
+            self._waiting.remove(ticket)
+            self._active += 1
+            self._running_by_user[ticket['user']] = self._running_by_user.get(ticket['user'], 0) + 1
+            wait = time.time() - enqueued_at
+            stats = self._stats[ticket['priority']]
+            stats['admitted'] += 1
+            stats['total_wait'] += wait
+            stats['max_wait'] = max(stats['max_wait'], wait)
+            self._condition.notify_all()
+        if wait > 1:
+            logger.info(f"{ticket['priority']} job for {ticket['user']} waited {wait:.1f}s for a transcription slot")
+
+    def _release(self, ticket):
+        with self._condition:
+            self._active -= 1
+            self._running_by_user[ticket['user']] -= 1
+            if not self._running_by_user[ticket['user']]:
+                del self._running_by_user[ticket['user']]
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, priority='normal', user=None, duration=None):
+        """Block until the job is admitted, then hold a transcription slot"""
+        with self._condition:
+            self._sequence += 1
+            ticket = {'priority': priority, 'user': user or 'anonymous', 'duration': duration,
+                      'sequence': self._sequence}
+
+        self._acquire(ticket)
+
+        outer, self._local.ticket = getattr(self._local, 'ticket', None), ticket
+        try:
+            yield ticket
+        finally:
+            self._local.ticket = outer
+            self._release(ticket)
+
+    def others_busy(self):
+        """Whether jobs other than this thread's hold or wait for a slot"""
+        with self._condition:
+            return self._active + len(self._waiting) > (1 if self.current_ticket() else 0)
+
+    def current_ticket(self):
+        """Ticket of the job holding a slot on this thread, or None"""
+        return getattr(self._local, 'ticket', None)
+
+    def should_yield(self, ticket):
+        """Whether all slots are taken and higher-priority work is waiting"""
+        rank = PRIORITY_CLASSES[ticket['priority']]
+        with self._condition:
+            return (self._active >= self.slots and
+                    any(PRIORITY_CLASSES[other['priority']] < rank for other in self._waiting))
+
+    def yield_slot(self, ticket):
+        """Hand the slot to waiting higher-priority work, then wait to be re-admitted"""
+        if self.should_yield(ticket):
+            with self._condition:
+                self._stats[ticket['priority']]['preemptions'] += 1
+            logger.info(f"{ticket['priority']} job for {ticket['user']} yielding to higher-priority work")
+            self._release(ticket)
+            self._acquire(ticket)
+
+    def stats(self):
+        """Queue wait statistics per priority class"""
+        with self._condition:
+            waiting = {name: 0 for name in PRIORITY_CLASSES}
+            for ticket in self._waiting:
+                waiting[ticket['priority']] += 1
+            return {
+                'slots': self.slots,
+                'running': self._active,
+                'classes': {name: {
+                    'waiting': waiting[name],
+                    'admitted': stats['admitted'],
+                    'avg_wait_seconds': round(stats['total_wait'] / stats['admitted'], 2) if stats['admitted'] else 0.0,
+                    'max_wait_seconds': round(stats['max_wait'], 2),
+                    'preemptions': stats['preemptions']
+                } for name, stats in self._stats.items()}
+            }
+
+scheduler = TranscriptionScheduler(TRANSCRIPTION_WORKERS)
+
+def request_user():
+    """Identify the requesting user for fair scheduling"""
+    return request.form.get('user') or request.headers.get('X-User') or request.remote_addr
+
+def extract_audio_region(audio_file_path, start, duration, output_path):
+    """Cut [start, start + duration) seconds of audio into a 16 kHz mono WAV file"""
+    try:
+        result = subprocess.run([
+            'ffmpeg', '-v', 'error', '-ss', f"{start:.3f}", '-t', f"{duration:.3f}", '-i', audio_file_path,
+            '-ar', '16000', '-ac', '1', '-y', output_path
+        ], capture_output=True, text=True, timeout=120)
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        raise Exception(f"Audio extraction failed: {str(e)}")
+    if result.returncode != 0:
+        raise Exception(f"Audio extraction failed: {result.stderr}")
+    return output_path
+
+def transcribe_chunked(audio_file_path, language, duration, ticket, job_id=None):
+    """Transcribe long audio chunk by chunk, yielding the slot between chunks
+
+    With a job_id every finished chunk is checkpointed, and chunks already
+    checkpointed by an earlier attempt are reused instead of re-transcribed.
+    """
+    chunked = bool(duration and duration > TRANSCRIPTION_CHUNK_SECONDS and shutil.which('ffmpeg'))
+    spans = []
+    if chunked:
+        # Cut at the silence nearest each chunk length so no word is split between chunks;
+        # the same file always yields the same cuts, so checkpoints stay valid on resume
+        try:
+            boundaries = _speech_boundaries(audio_file_path)
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.warning(f"Silence detection failed, cutting chunks at fixed offsets: {str(e)}")
+            boundaries = []
+        snap = min(30.0, TRANSCRIPTION_CHUNK_SECONDS / 4.0)
+        start = 0.0
+        while start < duration:
+            target = start + TRANSCRIPTION_CHUNK_SECONDS
+            nearby = [b for b in boundaries if abs(b - target) <= snap and b < duration]
+            end = min(nearby, key=lambda b: abs(b - target)) if nearby and target < duration else min(target, duration)
+            spans.append((start, end - start))
+            start = end
+    else:
+        spans.append((0.0, duration or 0.0))
+
+    done = {}
+    if job_id:
+        # Only trust checkpoints whose boundaries still match this chunk layout
+        for idx, chunk in load_job_chunks(job_id).items():
+            if idx < len(spans) and abs(chunk['start'] - spans[idx][0]) < 0.01 \
+                    and abs(chunk['end'] - sum(spans[idx])) < 0.01:
+                done[idx] = chunk
+        update_job(job_id, total_chunks=len(spans), done_chunks=len(done))
+        if done:
+            logger.info(f"Resuming job {job_id} with {len(done)}/{len(spans)} chunks already transcribed")
+
+    chunk_dir = tempfile.mkdtemp(prefix='chunks_') if chunked else None
+    try:
+        texts, segments, modes = [], [], []
+        for idx, (start, length) in enumerate(spans):
+            if idx in done:
+                text, chunk_segments, mode = done[idx]['text'], done[idx]['segments'], done[idx]['mode']
+            else:
+                if chunked:
+                    chunk_path = extract_audio_region(audio_file_path, start, length,
+                                                      os.path.join(chunk_dir, f"chunk_{idx}.wav"))
+                    (text, chunk_segments), mode = transcribe_audio(chunk_path, language, return_segments=True)
+                    os.unlink(chunk_path)
+                    for segment in chunk_segments:
+                        segment['start'] += start
+                        segment['end'] += start
+                    logger.info(f"Transcribed chunk {idx + 1} ({start:.0f}s-{start + length:.0f}s of {duration:.0f}s)")
+                else:
+                    (text, chunk_segments), mode = transcribe_audio(audio_file_path, language, return_segments=True)
+
+                if job_id:
+                    save_job_chunk(job_id, idx, start, start + length, text, chunk_segments, mode)
+                if idx < len(spans) - 1:
+                    scheduler.yield_slot(ticket)
+
+            texts.append(text)
+            modes.append(mode)
+            segments.extend(chunk_segments)
+
+        used_mode = modes[0] if len(set(modes)) == 1 else 'hybrid'
+        return ('\n'.join(text for text in texts if text), segments), used_mode
+    finally:
+        if chunk_dir:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+
+def run_transcription(audio_file_path, language="en", priority='normal', user=None, duration=None, job_id=None):
+    """Queue a transcription job and return ((transcription, segments), mode)"""
+    if duration is None:
+        duration = get_audio_duration(audio_file_path)
+    with scheduler.slot(priority, user, duration) as ticket:
+        return transcribe_chunked(audio_file_path, language, duration, ticket, job_id)
+
+# Incremental re-transcription
+_FP_RATE = 8000
+_FP_FRAME = 512        # 64 ms analysis frames
+_FP_STEP_SAMPLES = 64  # 8 ms steps, searched for sub-frame alignment
+_FP_STEPS = 4          # stored frames are every 4th step (32 ms)
+_FP_BANDS = 25         # 24 bits per frame
+_FP_ANCHOR_MOD = 16    # only frame values divisible by this are indexed
+_FP_MIN_VOTES = 4
+_FP_MAX_BIT_ERRORS = 0.35
+_fp_filters = None
+
+def _fingerprint_filters(np):
+    """Band-summing matrix and analysis window for fingerprint frames, built once"""
+    global _fp_filters
+    if _fp_filters is None:
+        edges = np.geomspace(300, 3400, _FP_BANDS + 1)
+        band = np.digitize(np.fft.rfftfreq(_FP_FRAME, 1.0 / _FP_RATE), edges) - 1
+        filters = np.zeros((_FP_FRAME // 2 + 1, _FP_BANDS), dtype=np.float32)
+        for b in range(_FP_BANDS):
+            filters[band == b, b] = 1.0
+        _fp_filters = (filters, np.hanning(_FP_FRAME).astype(np.float32))
+    return _fp_filters
+
+def _popcount(np, values):
+    """Number of set bits in each 32-bit value"""
+    return np.unpackbits(values.astype('>u4').view(np.uint8)).reshape(-1, 32).sum(axis=1)
+
+def fingerprint_audio(audio_file_path):
+    """Noise-tolerant audio fingerprint of a recording, or None without numpy.
+
+    Every 8 ms step gets 24 bits: the signs of how the energy differences
+    between 25 log-spaced bands (300-3400 Hz) changed since 32 ms earlier.
+    Signs of energy deltas survive gain changes, dither and lossy
+    re-encoding, so different encodes of the same audio differ in only a
+    few bits per frame. Every 4th step is stored; the 8 ms steps of a new
+    upload give sub-frame alignment against them.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        logger.info("Incremental transcription skipped: numpy is not installed")
+        return None
+
+    filters, window = _fingerprint_filters(np)
+    values, unreliable, energy = [], [], []
+    carry = np.zeros(0, dtype=np.float32)
+    previous = np.zeros((_FP_STEPS, _FP_BANDS - 1), dtype=np.float32)
+    try:
+        for block in stream_pcm(audio_file_path, _FP_RATE):
+            samples = np.concatenate([carry, np.frombuffer(block, dtype=np.int16).astype(np.float32)])
+            count = (len(samples) - _FP_FRAME) // _FP_STEP_SAMPLES + 1
+            if count <= 0:
+                carry = samples
+                continue
+            frames = np.lib.stride_tricks.sliding_window_view(samples, _FP_FRAME)[::_FP_STEP_SAMPLES][:count]
+            bands = (np.abs(np.fft.rfft(frames * window)) ** 2) @ filters
+            carry = samples[count * _FP_STEP_SAMPLES:]
+
+            differences = np.concatenate([previous, bands[:, :-1] - bands[:, 1:]])
+            delta = differences[_FP_STEPS:] - differences[:-_FP_STEPS]
+            previous = differences[-_FP_STEPS:]
+            values.append(((delta > 0) << np.arange(_FP_BANDS - 1, dtype=np.uint32)).sum(axis=1, dtype=np.uint32))
+            unreliable.append(np.argsort(np.abs(delta), axis=1)[:, :2].astype(np.uint8))
+            energy.append(10 * np.log10(bands.sum(axis=1) + 1e-3))
+    except Exception as e:
+        logger.warning(f"Fingerprinting skipped: {str(e)}")
+        return None
+
+    if not values or sum(len(v) for v in values) < _FP_STEPS * fingerprint_window_frames():
+        return None
+    fine = np.concatenate(values)
+    energy = np.concatenate(energy)
+    # The first steps have no predecessor, and quiet steps carry no usable signal
+    active = energy > max(np.percentile(energy, 90) - 30, energy.min() + 6)
+    active[:_FP_STEPS] = False
+    return {
+        'fine': fine,
+        'unreliable': np.concatenate(unreliable),
+        'fine_active': active,
+        'frames': fine[::_FP_STEPS],
+        'active': active[::_FP_STEPS]
+    }
+
+def fingerprint_window_frames():
+    """Stored frames compared at once when verifying an alignment"""
+    return max(1, int(round(FINGERPRINT_WINDOW_SECONDS * _FP_RATE / (_FP_STEP_SAMPLES * _FP_STEPS))))
+
+def save_fingerprint(cursor, transcription_id, fingerprint):
+    """Store a transcription's fingerprint frames and its indexed anchor frames"""
+    if fingerprint is None:
+        return
+    import numpy as np
+
+    cursor.execute("DELETE FROM fingerprint_frames WHERE transcription_id = ?", (transcription_id,))
+    cursor.execute("DELETE FROM fingerprint_anchors WHERE transcription_id = ?", (transcription_id,))
+    frames, active = fingerprint['frames'], fingerprint['active']
+    cursor.execute("INSERT INTO fingerprint_frames (transcription_id, frame_count, frames, active) VALUES (?, ?, ?, ?)",
+                   (transcription_id, len(frames), frames.astype('<u4').tobytes(), np.packbits(active).tobytes()))
+    anchors = np.nonzero(active & (frames % _FP_ANCHOR_MOD == 0))[0]
+    cursor.executemany("INSERT INTO fingerprint_anchors (transcription_id, frame, hash) VALUES (?, ?, ?)",
+                       [(transcription_id, int(frame), int(frames[frame])) for frame in anchors])
+
+def _find_alignments(np, fingerprint):
+    """Vote for (transcription_id, step offset) pairs using anchor frames that match exactly
+    or after flipping the new frame's two least reliable bits"""
+    fine, unreliable = fingerprint['fine'], fingerprint['unreliable']
+    first = np.left_shift(np.uint32(1), unreliable[:, 0].astype(np.uint32))
+    second = np.left_shift(np.uint32(1), unreliable[:, 1].astype(np.uint32))
+    candidates = np.stack([fine, fine ^ first, fine ^ second, fine ^ first ^ second], axis=1)
+    positions, variants = np.nonzero((candidates % _FP_ANCHOR_MOD == 0) & fingerprint['fine_active'][:, None])
+
+    conn = init_db()
+    try:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS new_anchors (pos INTEGER, hash INTEGER)")
+        conn.execute("DELETE FROM new_anchors")
+        conn.executemany("INSERT INTO new_anchors (pos, hash) VALUES (?, ?)",
+                         zip(positions.tolist(), candidates[positions, variants].tolist()))
+        matches = conn.execute('''
+            SELECT a.transcription_id, n.pos - ? * a.frame FROM new_anchors n
+            JOIN fingerprint_anchors a ON a.hash = n.hash
+        ''', (_FP_STEPS,)).fetchall()
+        conn.execute("DELETE FROM new_anchors")
+    finally:
+        conn.close()
+
+    votes = {}
+    for key in matches:
+        votes[key] = votes.get(key, 0) + 1
+    # Neighbouring offsets are the same alignment seen from adjacent 8 ms steps
+    return {(source_id, offset): sum(votes.get((source_id, offset + d), 0) for d in (-1, 0, 1))
+            for source_id, offset in votes}
+
+def _speech_windows(np, active):
+    """Per stored window, whether enough of it is loud enough to compare"""
+    window = fingerprint_window_frames()
+    return [bool(active[start:start + window].sum() >= 0.25 * window) for start in range(0, len(active), window)]
+
+def _aligned_windows(np, fingerprint, frames, active, offset):
+    """Compare a stored fingerprint with the new one at a step offset.
+
+    Returns (per-window result, mean bit error rate): True if the window
+    matches, False if it differs, None if it is silent or outside the new
+    recording.
+    """
+    window = fingerprint_window_frames()
+    positions = np.arange(len(frames)) * _FP_STEPS + offset
+    inside = (positions >= 0) & (positions < len(fingerprint['fine']))
+    errors = np.zeros(len(frames))
+    errors[inside] = _popcount(np, frames[inside] ^ fingerprint['fine'][positions[inside]]) / (_FP_BANDS - 1.0)
+
+    usable = active & inside
+    result = []
+    for start in range(0, len(frames), window):
+        in_window = usable[start:start + window]
+        if in_window.sum() < 0.25 * window:
+            result.append(None)
+        else:
+            result.append(bool(errors[start:start + window][in_window].mean() <= _FP_MAX_BIT_ERRORS))
+    return result, float(errors[usable].mean()) if usable.any() else 1.0
+
+def plan_incremental(fingerprint, duration):
+    """Work out which regions of a recording are already transcribed, or None if too little is reusable"""
+    import numpy as np
+
+    step_seconds = _FP_STEP_SAMPLES / float(_FP_RATE)
+    frame_seconds = step_seconds * _FP_STEPS
+    window_seconds = fingerprint_window_frames() * frame_seconds
+    duration = duration or len(fingerprint['fine']) * step_seconds
+
+    votes = _find_alignments(np, fingerprint)
+    if not votes or max(votes.values()) < _FP_MIN_VOTES:
+        return None
+
+    # The stored recording with the strongest alignment is the one being extended or edited;
+    # it may appear at several offsets when the new recording was cut or rearranged
+    source_id = max(votes, key=votes.get)[0]
+    offsets = []
+    for (candidate_id, offset), count in sorted(votes.items(), key=lambda item: -item[1]):
+        if candidate_id == source_id and count >= _FP_MIN_VOTES and \
+                all(abs(offset - other) > _FP_STEPS for other in offsets):
+            offsets.append(offset)
+
+    conn = init_db()
+    try:
+        frame_count, frames, active = conn.execute(
+            "SELECT frame_count, frames, active FROM fingerprint_frames WHERE transcription_id = ?",
+            (source_id,)).fetchone()
+        rows = conn.execute('''SELECT start_time, end_time, text, speaker FROM segments
+                               WHERE transcription_id = ? ORDER BY idx''', (source_id,)).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        return None
+    frames = np.frombuffer(frames, dtype='<u4')
+    active = np.unpackbits(np.frombuffer(active, dtype=np.uint8))[:frame_count].astype(bool)
+    source_seconds = frame_count * frame_seconds
+
+    # Refine each alignment to the best 8 ms step, then keep runs of matching windows;
+    # silent windows inside a run do not break it
+    regions, claimed = [], []
+    for offset in offsets[:8]:
+        windows, _, offset = min((_aligned_windows(np, fingerprint, frames, active, offset + d) + (offset + d,)
+                                  for d in (-1, 0, 1)), key=lambda result: result[1])
+        shift = offset * step_seconds
+        run = None
+        for index, matched in enumerate(windows + [False]):
+            if matched:
+                run = (run[0] if run else index, index + 1)
+            elif matched is False and run:
+                new_start = max(run[0] * window_seconds + shift, 0.0)
+                new_end = min(min(run[1] * window_seconds, source_seconds) + shift, duration)
+                if new_end - new_start > window_seconds and \
+                        not any(new_start < end and start < new_end for start, end in claimed):
+                    claimed.append((new_start, new_end))
+                    regions.append({'new_start': new_start, 'new_end': new_end,
+                                    'old_start': new_start - shift, 'old_end': new_end - shift})
+                run = None
+    if not regions:
+        return None
+    regions.sort(key=lambda region: region['new_start'])
+
+    # Patch only when the new recording extends the source: every region keeps one alignment
+    # and together they run from the source's first window with speech to its last
+    speech = [index for index, loud in enumerate(_speech_windows(np, active)) if loud]
+    alignments = [region['new_start'] - region['old_start'] for region in regions]
+    extends_source = (bool(speech) and max(alignments) - min(alignments) < 2 * step_seconds and
+                      regions[0]['old_start'] <= speech[0] * window_seconds + frame_seconds and
+                      max(region['old_end'] for region in regions) >=
+                      min((speech[-1] + 1) * window_seconds, source_seconds) - frame_seconds)
+
+    # Reuse only whole segments inside a matched region; anything cut at an edge is re-transcribed
+    reused, covered = [], []
+    for region in regions:
+        offset = region['new_start'] - region['old_start']
+        inside = [row for row in rows if row[0] >= region['old_start'] - 0.05 and row[1] <= region['old_end'] + 0.05]
+        if not inside:
+            continue
+        start = region['new_start'] if region['new_start'] == 0 else inside[0][0] + offset
+        end = inside[-1][1] + offset
+        covered.append((start, end))
+        reused.extend({'start': row[0] + offset, 'end': row[1] + offset, 'text': row[2]} for row in inside)
+
+    reused_seconds = sum(end - start for start, end in covered)
+    if reused_seconds < INCREMENTAL_MIN_REUSE_SECONDS:
+        return None
+
+    gaps, cursor_time = [], 0.0
+    for start, end in covered:
+        if start - cursor_time > 0.5:
+            gaps.append((cursor_time, start))
+        cursor_time = max(cursor_time, end)
+    if duration - cursor_time > 0.5:
+        gaps.append((cursor_time, duration))
+
+    logger.info(f"Incremental plan: reusing {reused_seconds:.0f}s from transcription {source_id}, "
+                f"transcribing {len(gaps)} region(s)")
+    return {
+        'source_id': source_id,
+        'patch': extends_source,
+        'reused_segments': reused,
+        'gaps': gaps,
+        'reused_seconds': reused_seconds,
+        'transcribed_seconds': sum(end - start for start, end in gaps)
+    }
+
+def transcribe_incremental(audio_file_path, plan, language="en", priority='normal', user=None, job_id=None):
+    """Transcribe only the new regions of a recording and merge them with reused segments
+
+    With a job_id every transcribed region is checkpointed as a chunk, and
+    regions already checkpointed by an earlier attempt are reused.
+    """
+    segments = list(plan['reused_segments'])
+    modes = []
+    done = {}
+    if job_id:
+        # Only trust checkpoints whose boundaries still match this plan's regions
+        for idx, chunk in load_job_chunks(job_id).items():
+            if idx < len(plan['gaps']) and abs(chunk['start'] - plan['gaps'][idx][0]) < 0.01 \
+                    and abs(chunk['end'] - plan['gaps'][idx][1]) < 0.01:
+                done[idx] = chunk
+        update_job(job_id, total_chunks=len(plan['gaps']), done_chunks=len(done))
+        if done:
+            logger.info(f"Resuming job {job_id} with {len(done)}/{len(plan['gaps'])} new regions already transcribed")
+
+    region_dir = tempfile.mkdtemp(prefix='regions_')
+    try:
+        for index, (start, end) in enumerate(plan['gaps']):
+            if index in done:
+                region_segments, mode = done[index]['segments'], done[index]['mode']
+            else:
+                region_path = extract_audio_region(audio_file_path, start, end - start,
+                                                   os.path.join(region_dir, f"region_{index}.wav"))
+                (region_text, region_segments), mode = run_transcription(
+                    region_path, language, priority=priority, user=user, duration=end - start)
+                for segment in region_segments:
+                    segment['start'] += start
+                    segment['end'] += start
+                if job_id:
+                    save_job_chunk(job_id, index, start, end, region_text, region_segments, mode)
+            modes.append(mode)
+            segments.extend(region_segments)
+    finally:
+        shutil.rmtree(region_dir, ignore_errors=True)
+
+    segments.sort(key=lambda segment: segment['start'])
+    used_mode = 'incremental' if not modes else f"incremental+{modes[0] if len(set(modes)) == 1 else 'hybrid'}"
+    return ('\n'.join(segment['text'] for segment in segments), segments), used_mode
+
+def patch_transcription(transcription_id, filename, transcription, file_size, segments=None, fingerprint=None,
+                        job_id=None):
+    """Patch an existing transcription with an extended recording and drop its stale summary
+    (marking job_id completed in the same transaction)"""
+    conn = init_db()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            update_transcription(cursor, transcription_id, filename, transcription,
+                                 file_size, segments, fingerprint)
+            if job_id:
+                mark_job_completed(cursor, job_id, transcription_id)
+    finally:
+        conn.close()
+
+    save_transcription_file(transcription_id, transcription)
+    summary_file = f"Results/summary_{transcription_id}.txt"
+    if os.path.exists(summary_file):
+        os.remove(summary_file)
+    logger.info(f"Patched transcription {transcription_id} and invalidated its summary")
+    return transcription_id
+
+# Resumable transcription jobs
+_JOB_COLUMNS = ('id', 'filename', 'upload_path', 'file_size', 'language', 'priority', 'user', 'status',
+                'duration', 'total_chunks', 'done_chunks', 'error', 'transcription_id', 'created_at', 'updated_at',
+                'batch_id', 'original_name', 'transcription_mode', 'upload_metrics')
+_active_jobs = set()
+_active_jobs_lock = threading.Lock()
+
+def create_job(filename, upload_path, file_size, language="en", priority=None, user=None,
+               batch_id=None, original_name=None, duration=None):
+    """Record a new transcription job; its source audio stays in Uploads until it completes"""
+    conn = init_db()
+    try:
+        with conn:
+            cursor = conn.execute("""INSERT INTO transcription_jobs
+                                     (filename, upload_path, file_size, language, priority, user, status,
+                                      batch_id, original_name, duration)
+                                     VALUES (?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?)""",
+                                  (filename, upload_path, file_size, language, priority, user,
+                                   batch_id, original_name, duration))
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+def update_job(job_id, **fields):
+    """Update columns of a job row and bump its updated_at timestamp"""
+    assignments = ''.join(f"{name} = ?, " for name in fields)
+    conn = init_db()
+    try:
+        with conn:
+            conn.execute(f"UPDATE transcription_jobs SET {assignments}updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                         (*fields.values(), job_id))
+    finally:
+        conn.close()
+
+def load_job(job_id):
+    """Return a job row as a dict, or None if it does not exist"""
+    conn = init_db()
+    try:
+        row = conn.execute(f"SELECT {', '.join(_JOB_COLUMNS)} FROM transcription_jobs WHERE id = ?",
+                           (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return dict(zip(_JOB_COLUMNS, row)) if row else None
+
+def load_job_chunks(job_id):
+    """Return checkpointed chunks of a job keyed by chunk index"""
+    conn = init_db()
+    try:
+        rows = conn.execute("""SELECT idx, start_time, end_time, text, segments, mode
+                               FROM job_chunks WHERE job_id = ?""", (job_id,)).fetchall()
+    finally:
+        conn.close()
+    return {idx: {'start': start, 'end': end, 'text': text, 'segments': json.loads(segments), 'mode': mode}
+            for idx, start, end, text, segments, mode in rows}
+
+def save_job_chunk(job_id, idx, start, end, text, segments, mode):
+    """Checkpoint a finished chunk and the job's progress in one transaction"""
+    conn = init_db()
+    try:
+        with conn:
+            conn.execute("""INSERT OR REPLACE INTO job_chunks
+                            (job_id, idx, start_time, end_time, text, segments, mode)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                         (job_id, idx, start, end, text, json.dumps(segments), mode))
+            conn.execute("""UPDATE transcription_jobs
+                            SET done_chunks = (SELECT COUNT(*) FROM job_chunks WHERE job_id = ?),
+                                updated_at = CURRENT_TIMESTAMP
+                            WHERE id = ?""", (job_id, job_id))
+    finally:
+        conn.close()
+
+def mark_job_completed(cursor, job_id, transcription_id):
+    """Mark a job completed and drop its checkpoints, which now live in the segments table"""
+    cursor.execute("""UPDATE transcription_jobs
+                      SET status = 'completed', error = NULL, transcription_id = ?,
+                          done_chunks = total_chunks, transcription = NULL, segments = NULL,
+                          updated_at = CURRENT_TIMESTAMP
+                      WHERE id = ?""", (transcription_id, job_id))
+    cursor.execute("DELETE FROM job_chunks WHERE job_id = ?", (job_id,))
+
+def discard_job(job):
+    """Delete an unfinished job, its checkpoints and its source audio"""
+    conn = init_db()
+    try:
+        with conn:
+            conn.execute("DELETE FROM job_chunks WHERE job_id = ?", (job['id'],))
+            conn.execute("DELETE FROM transcription_jobs WHERE id = ?", (job['id'],))
+    finally:
+        conn.close()
+    if job['upload_path'] and os.path.exists(job['upload_path']):
+        os.unlink(job['upload_path'])
+    logger.info(f"Discarded transcription job {job['id']}")
+
+def job_status(job):
+    """Public view of a job row, including progress and how to resume it"""
+    total = job['total_chunks'] or 0
+    done = job['done_chunks'] or 0
+    return {
+        'job_id': job['id'],
+        'filename': job['filename'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at'],
+        'file_size': job['file_size'],
+        'status': job['status'],
+        'done_chunks': done,
+        'total_chunks': total,
+        'progress': round(100.0 * done / total, 1) if total else 0.0,
+        'error': job['error'],
+        'transcription_id': job['transcription_id'],
+        'batch_id': job['batch_id'],
+        # Batch items are retried with their batch, never stored on their own
+        'resume_url': (None if job['status'] == 'completed' else
+                       f"/upload/batch/{job['batch_id']}/resume" if job['batch_id'] else
+                       f"/jobs/{job['id']}/resume"),
+        'discard_url': f"/jobs/{job['id']}" if job['status'] != 'completed' else None
+    }
+
+def claim_job(job_id):
+    """Mark a job as being processed by this process; False if it already is"""
+    with _active_jobs_lock:
+        if job_id in _active_jobs:
+            return False
+        _active_jobs.add(job_id)
+        return True
+
+def process_job(job_id):
+    """Run a claimed job from its last checkpoint and return the upload response payload"""
+    try:
+        job = load_job(job_id)
+        audio_file_path = job['upload_path']
+        if not os.path.exists(audio_file_path):
+            raise Exception(f"Source audio for job {job_id} is missing")
+
+        # Diarize in parallel with transcription when enabled
+        diarization = start_diarization(audio_file_path)
+
+        # Short recordings count as interactive unless the client says otherwise
+        duration = job['duration'] or get_audio_duration(audio_file_path)
+        priority = job['priority']
+        if not priority:
+            priority = 'interactive' if duration is not None and duration <= INTERACTIVE_MAX_SECONDS else 'normal'
+        update_job(job_id, status='running', error=None, duration=duration, priority=priority)
+
+        # Reuse stored segments for audio regions that were already transcribed
+        fingerprint = fingerprint_audio(audio_file_path) if INCREMENTAL_TRANSCRIPTION else None
+        plan = plan_incremental(fingerprint, duration) if fingerprint else None
+
+        metrics = start_job_metrics()
+        if plan:
+            (transcription, segments), used_mode = transcribe_incremental(
+                audio_file_path, plan, job['language'], priority=priority, user=job['user'], job_id=job_id)
+        else:
+            (transcription, segments), used_mode = run_transcription(
+                audio_file_path, job['language'], priority=priority, user=job['user'],
+                duration=duration, job_id=job_id)
+        segments = attach_speakers(segments, diarization)
+        logger.info(f"Transcription completed using {used_mode} mode: {transcription[:100]}...")
+
+        transcription = format_transcription(transcription)
+
+        # Store in database, patching the earlier transcript when this recording extends it
+        if plan and plan['patch']:
+            transcription_id = patch_transcription(
+                plan['source_id'], job['filename'], transcription, job['file_size'], segments, fingerprint, job_id)
+        else:
+            transcription_id = store_transcription(
+                job['filename'], transcription, job['file_size'], segments, fingerprint, job_id)
+    except Exception as e:
+        update_job(job_id, status='failed', error=str(e))
+        raise
+    finally:
+        with _active_jobs_lock:
+            _active_jobs.discard(job_id)
+
+    return {
+        'transcription': transcription,
+        'transcription_id': transcription_id,
+        'job_id': job_id,
+        'filename': job['filename'],
+        'transcription_mode': used_mode,
+        'incremental': {
+            'source_transcription_id': plan['source_id'],
+            'patched': plan['patch'],
+            'reused_seconds': round(plan['reused_seconds'], 1),
+            'transcribed_seconds': round(plan['transcribed_seconds'], 1)
+        } if plan else None,
+        'upload_metrics': metrics if metrics['online_requests'] else None,
+        'download_url': f'/download/transcription/{transcription_id}'
+    }
+
+def _resume_job(job_id):
+    """Background wrapper for resuming an interrupted job"""
+    try:
+        process_job(job_id)
+        logger.info(f"Resumed job {job_id} completed")
+    except Exception as e:
+        logger.error(f"Resumed job {job_id} failed: {str(e)}")
+
+def resume_interrupted_jobs():
+    """Resume jobs a previous process left pending or running, in the background"""
+    conn = init_db()
+    try:
+        job_ids = [row[0] for row in conn.execute("""SELECT id FROM transcription_jobs
+                                                     WHERE status IN ('pending', 'running') AND batch_id IS NULL
+                                                     ORDER BY id""")]
+    finally:
+        conn.close()
+
+    for job_id in job_ids:
+        if claim_job(job_id):
+            logger.info(f"Resuming interrupted transcription job {job_id}")
+            threading.Thread(target=_resume_job, args=(job_id,), daemon=True).start()
+    return job_ids
+
+# Whisper model registry and benchmark-driven selection
+MODEL_SIZES = ['tiny', 'base', 'small', 'medium', 'large-v3-turbo', 'large-v1', 'large-v2', 'large-v3']
+_model_selection = {'status': 'pending', 'mode': WHISPER_MODEL_SELECTION, 'benchmarked_at': None, 'error': None}
+_model_lock = threading.Lock()
+
+def parse_model_name(filename):
+    """Split a ggml model filename into (size, english_only, quantization), or None"""
+    match = re.match(r'^ggml-(tiny|base|small|medium|large-v\d(?:-turbo)?)(\.en)?(?:-(q\d_\w+))?\.bin$', filename)
+    if not match:
+        return None
+    return match.group(1), bool(match.group(2)), match.group(3) or ''
+
+def model_accuracy_rank(filename):
+    """Higher is more accurate: model size first, then quantization bits; multilingual before .en"""
+    size, english_only, quantization = parse_model_name(filename)
+    # Sizes newer than this list rank above it by version; unquantized files are f16
+    size_rank = MODEL_SIZES.index(size) if size in MODEL_SIZES else len(MODEL_SIZES) + int(size[7])
+    quantization_rank = (int(quantization[1]), quantization) if quantization else (16, '')
+    return (size_rank, quantization_rank, not english_only)
+
+def discover_models():
+    """Available ggml model files in WHISPER_MODELS_DIR, least accurate first"""
+    try:
+        names = [name for name in os.listdir(WHISPER_MODELS_DIR) if parse_model_name(name)]
+    except OSError:
+        return []
+    return [os.path.join(WHISPER_MODELS_DIR, name) for name in sorted(names, key=model_accuracy_rank)]
+
+def benchmark_host():
+    import platform
+    return f"{platform.node()}:{detect_cores()}"
+
+def calibration_threads():
+    """Thread count every model is benchmarked with, so results compare like for like"""
+    return WHISPER_THREADS or governor.usable_cores()
+
+def load_model_benchmarks():
+    """Stored calibration results for this host and thread count: model filename -> row"""
+    conn = init_db()
+    try:
+        rows = conn.execute('''SELECT model, rtf, wall_seconds, audio_seconds, created_at, threads
+                               FROM model_benchmarks WHERE host = ? AND threads = ?''',
+                            (benchmark_host(), calibration_threads())).fetchall()
+    finally:
+        conn.close()
+    return {row[0]: {'rtf': row[1], 'wall_seconds': row[2], 'audio_seconds': row[3], 'created_at': row[4],
+                     'threads': row[5]}
+            for row in rows}
+
+def benchmark_models():
+    """Time each available model on the calibration clip, least accurate first, all with the same threads"""
+    if not os.path.exists(CALIBRATION_AUDIO):
+        raise Exception(f"Calibration audio {CALIBRATION_AUDIO} not found")
+    # whisper decodes in 30s windows, so shorter clips still cost a full window
+    audio_seconds = max(get_audio_duration(CALIBRATION_AUDIO) or 0.0, 30.0)
+    threads = calibration_threads()
+
+    too_slow = False
+    for model_path in discover_models():
+        # Models are ordered by accuracy, so once one is far too slow only bigger ones follow;
+        # turbo models are the exception, with a much lighter decoder than their rank suggests
+        if too_slow and '-turbo' not in os.path.basename(model_path):
+            continue
+        started = time.time()
+        try:
+            transcribe_offline(CALIBRATION_AUDIO, "en", model_path=model_path, threads=threads)
+        except Exception as e:
+            logger.warning(f"Benchmark of {os.path.basename(model_path)} failed: {str(e)}")
+            continue
+        wall_seconds = time.time() - started
+        rtf = wall_seconds / audio_seconds
+        logger.info(f"Benchmark {os.path.basename(model_path)}: {wall_seconds:.1f}s with {threads} thread(s), "
+                    f"real-time factor {rtf:.2f}")
+
+        conn = init_db()
+        try:
+            with conn:
+                conn.execute('''INSERT OR REPLACE INTO model_benchmarks
+                                (host, model, threads, rtf, wall_seconds, audio_seconds, created_at)
+                                VALUES (?, ?, ?, ?, ?, ?, datetime('now'))''',
+                             (benchmark_host(), os.path.basename(model_path), threads, rtf, wall_seconds, audio_seconds))
+        finally:
+            conn.close()
+
+        if rtf > WHISPER_TARGET_RTF * 2:
+            too_slow = True
+
+def set_whisper_model(model_path):
+    """Switch the model used for new offline transcriptions"""
+    global WHISPER_MODEL_PATH
+    with _model_lock:
+        WHISPER_MODEL_PATH = model_path
+        _availability_cache['checked_at'] = 0.0
+    logger.info(f"Whisper model set to {os.path.basename(model_path)}")
+
+def auto_select_model(force_benchmark=False):
+    """Pick the most accurate model that meets WHISPER_TARGET_RTF, benchmarking on first start"""
+    if not os.access(WHISPER_CPP_PATH, os.X_OK) or not discover_models():
+        _model_selection['status'] = 'unavailable'
+        return None
+
+    benchmarks = {} if force_benchmark else load_model_benchmarks()
+    if not benchmarks:
+        _model_selection['status'] = 'benchmarking'
+        try:
+            benchmark_models()
+        except Exception as e:
+            _model_selection.update(status='failed', error=str(e))
+            raise
+        benchmarks = load_model_benchmarks()
+
+    measured = [path for path in discover_models() if os.path.basename(path) in benchmarks]
+    if not measured:
+        _model_selection['status'] = 'failed'
+        return None
+    fast_enough = [path for path in measured if benchmarks[os.path.basename(path)]['rtf'] <= WHISPER_TARGET_RTF]
+    if fast_enough:
+        selected = fast_enough[-1]
+    else:
+        selected = min(measured, key=lambda path: benchmarks[os.path.basename(path)]['rtf'])
+        logger.warning(f"No model meets real-time factor {WHISPER_TARGET_RTF}; using the fastest")
+
+    set_whisper_model(selected)
+    _model_selection.update(status='selected', error=None,
+                            benchmarked_at=max(row['created_at'] for row in benchmarks.values()))
+    return selected
+
+def model_selection_status():
+    """Selected model with its measured throughput, for /transcription-status"""
+    benchmarks = load_model_benchmarks()
+    current = benchmarks.get(os.path.basename(WHISPER_MODEL_PATH))
+    return {
+        'mode': _model_selection['mode'],
+        'status': _model_selection['status'],
+        'error': _model_selection['error'],
+        'selected_model': os.path.basename(WHISPER_MODEL_PATH),
+        'target_rtf': WHISPER_TARGET_RTF,
+        'measured_rtf': round(current['rtf'], 3) if current else None,
+        'benchmark_threads': calibration_threads(),
+        'throughput_x_realtime': round(1.0 / current['rtf'], 2) if current and current['rtf'] else None,
+        'benchmarked_at': _model_selection['benchmarked_at']
+    }
+
+# Startup and readiness
+_startup = {'started_at': time.time(), 'ready': False, 'model_preloaded': False, 'error': None}
+_startup_thread = None
+_availability_cache = {'checked_at': 0.0, 'offline': False, 'online': False}
+
+def cached_availability():
+    """Transcription availability, re-checked at most every AVAILABILITY_CACHE_SECONDS"""
+    if time.time() - _availability_cache['checked_at'] > AVAILABILITY_CACHE_SECONDS:
+        _availability_cache.update(offline=check_offline_availability(),
+                                   online=check_online_availability(),
+                                   checked_at=time.time())
+    return _availability_cache['offline'], _availability_cache['online']
+
+def preload_whisper_model():
+    """Warm the OS page cache with the whisper model (and the whisper server, if any)"""
+    started = time.time()
+    if os.path.exists(WHISPER_MODEL_PATH):
+        with open(WHISPER_MODEL_PATH, 'rb') as model_file:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(model_file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            while model_file.read(8 * 1024 * 1024):
+                pass
+    if WHISPER_SERVER_URL:
+        import httpx
+        httpx.get(WHISPER_SERVER_URL, timeout=10)
+    logger.info(f"Whisper model preloaded in {time.time() - started:.1f}s")
+
+def start_startup_tasks():
+    """Run startup tasks on a background thread, once per process"""
+    global _startup_thread
+    with _counters_lock:
+        if _startup_thread is None:
+            _startup_thread = threading.Thread(target=run_startup_tasks, daemon=True)
+            _startup_thread.start()
+
+def run_startup_tasks():
+    """Initialise the database and counters off the request path, then mark the service ready"""
+    try:
+        load_counters()
+        cached_availability()
+        _startup['ready'] = True
+        logger.info(f"Ready in {time.time() - _startup['started_at']:.2f}s")
+    except Exception as e:
+        _startup['error'] = str(e)
+        logger.error(f"Startup failed: {str(e)}")
+        return
+
+    if WHISPER_MODEL_SELECTION == 'auto':
+        try:
+            auto_select_model()
+        except Exception as e:
+            logger.warning(f"Automatic model selection failed: {str(e)}")
+
+    if PRELOAD_WHISPER_MODEL:
+        try:
+            preload_whisper_model()
+            _startup['model_preloaded'] = True
+        except Exception as e:
+            logger.warning(f"Whisper model preload failed: {str(e)}")
+
+    if RESUME_INTERRUPTED_JOBS and any(cached_availability()):
+        try:
+            resume_interrupted_jobs()
+            resume_interrupted_batches()
+        except Exception as e:
+            logger.warning(f"Resuming interrupted jobs failed: {str(e)}")
+
 # Ensure directories exist
 os.makedirs('Uploads', exist_ok=True)
 os.makedirs('Results', exist_ok=True)
+os.makedirs(BATCH_IMPORT_DIR, exist_ok=True)
 
 @app.route('/')
 def index():
@@ -264,6 +2224,10 @@ def upload_audio():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
 
+        priority = request.form.get('priority')
+        if priority and priority not in PRIORITY_CLASSES:
+            return jsonify({'error': f"Invalid priority. Must be one of: {', '.join(PRIORITY_CLASSES)}"}), 400
+
         # Check if any transcription method is available
         offline_available = check_offline_availability()
         online_available = check_online_availability()
@@ -271,7 +2235,7 @@ def upload_audio():
         if not offline_available and not online_available:
             return jsonify({'error': 'No transcription method available. Need either OpenAI API key or whisper.cpp setup.'}), 500
 
-        # Save uploaded file temporarily
+        # Keep the upload until its job completes so failed or interrupted jobs can resume
         filename = secure_filename(file.filename)
         timestamp = str(int(time.time()))
         safe_filename = f"{timestamp}_{filename}"
@@ -280,89 +2244,659 @@ def upload_audio():
         file.save(upload_path)
         file_size = os.path.getsize(upload_path)
 
-        # Create temporary file for transcription
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp_file:
-            file.seek(0)
-            temp_file.write(file.read())
-            temp_file_path = temp_file.name
-
         logger.info(f"Processing audio file: {filename} ({file_size} bytes)")
 
-        # Use the new transcription function
-        transcription, used_mode = transcribe_audio(temp_file_path, "en")
-        logger.info(f"Transcription completed using {used_mode} mode: {transcription[:100]}...")
-
-        # Format transcription with bullet points
-        if transcription and len(transcription.strip()) > 0:
-            sentences = []
-            current_sentence = ""
-            
-            for char in transcription:
-                current_sentence += char
-                if char in '.!?' or (char == '\n' and current_sentence.strip()):
-                    if current_sentence.strip():
-                        sentences.append(current_sentence.strip())
-                        current_sentence = ""
-            
-            if current_sentence.strip():
-                sentences.append(current_sentence.strip())
-            
-            if len(sentences) > 1:
-                formatted_sentences = []
-                for sentence in sentences:
-                    if sentence.strip():
-                        formatted_sentences.append(f"• {sentence.strip()}")
-                transcription = "\n".join(formatted_sentences)
-            
-            # Apply post-processing cleanup
-            logger.info("Applying post-processing cleanup...")
-            transcription = clean_transcription_artifacts(transcription)
-            logger.info(f"Cleaned transcription: {transcription[:100]}...")
+        job_id = create_job(safe_filename, upload_path, file_size, "en", priority, request_user())
+        claim_job(job_id)
+        result = process_job(job_id)
 
-        # Store in database
-        conn = init_db()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO transcriptions (filename, transcription, created_at, file_size)
-            VALUES (?, ?, datetime('now'), ?)
-        ''', (safe_filename, transcription, file_size))
+        return jsonify({'success': True, **result}), 200
         
-        transcription_id = cursor.lastrowid
-        conn.commit()
+    except Exception as e:
+        logger.error(f"Error processing audio: {str(e)}")
+        if 'job_id' in locals():
+            # Progress is checkpointed; keep the upload so the job can be resumed
+            return jsonify({
+                'error': str(e),
+                'job_id': job_id,
+                'resume_url': f'/jobs/{job_id}/resume'
+            }), 500
+        # Clean up the upload if no job was recorded for it
+        try:
+            if 'upload_path' in locals() and os.path.exists(upload_path):
+                os.unlink(upload_path)
+        except:
+            pass
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status and progress of a transcription job"""
+    job = load_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_status(job))
+
+@app.route('/jobs/<int:job_id>/resume', methods=['POST'])
+def resume_job(job_id):
+    """Resume a failed or interrupted job from its last checkpointed chunk"""
+    job = load_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] == 'completed':
+        return jsonify({**job_status(job), 'error': 'Job already completed'}), 409
+    if job['batch_id']:
+        return jsonify({**job_status(job), 'error': f"Job belongs to batch {job['batch_id']}; retry it with POST /upload/batch/{job['batch_id']}/resume"}), 409
+    if not claim_job(job_id):
+        return jsonify({**job_status(job), 'error': 'Job is already running'}), 409
+
+    try:
+        result = process_job(job_id)
+        return jsonify({'success': True, **result}), 200
+    except Exception as e:
+        logger.error(f"Error resuming job {job_id}: {str(e)}")
+        return jsonify({'error': str(e), 'job_id': job_id, 'resume_url': f'/jobs/{job_id}/resume'}), 500
+
+@app.route('/jobs/<int:job_id>', methods=['DELETE'])
+def delete_job(job_id):
+    """Discard a failed or interrupted job together with its uploaded audio"""
+    job = load_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] == 'completed':
+        return jsonify({**job_status(job), 'error': 'Job already completed'}), 409
+    if not claim_job(job_id):
+        return jsonify({**job_status(job), 'error': 'Job is running'}), 409
+
+    try:
+        discard_job(job)
+        return jsonify({'success': True, 'job_id': job_id}), 200
+    except Exception as e:
+        logger.error(f"Error discarding job {job_id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        with _active_jobs_lock:
+            _active_jobs.discard(job_id)
+
+# Batch registry: batches and their items (transcription jobs tagged with the batch id) live in
+# the database, so progress and finished results survive a restart and nothing is kept in memory
+_BATCH_COLUMNS = ('id', 'status', 'priority', 'user', 'error', 'created_at', 'started_at', 'finished_at')
+
+def create_batch(batch_id, priority, user):
+    """Record a batch that is still receiving its uploads"""
+    conn = init_db()
+    try:
+        with conn:
+            conn.execute("""INSERT INTO transcription_batches (id, status, priority, user, created_at)
+                            VALUES (?, 'receiving', ?, ?, ?)""", (batch_id, priority, user, time.time()))
+    finally:
+        conn.close()
+
+def update_batch(batch_id, **fields):
+    """Update columns of a batch row"""
+    assignments = ', '.join(f"{name} = ?" for name in fields)
+    conn = init_db()
+    try:
+        with conn:
+            conn.execute(f"UPDATE transcription_batches SET {assignments} WHERE id = ?", (*fields.values(), batch_id))
+    finally:
+        conn.close()
+
+def load_batch(batch_id):
+    """Return a batch row with its items as job dicts, or None if it does not exist"""
+    conn = init_db()
+    try:
+        row = conn.execute(f"SELECT {', '.join(_BATCH_COLUMNS)} FROM transcription_batches WHERE id = ?",
+                           (batch_id,)).fetchone()
+        if not row:
+            return None
+        items = conn.execute(f"SELECT {', '.join(_JOB_COLUMNS)} FROM transcription_jobs WHERE batch_id = ? ORDER BY id",
+                             (batch_id,)).fetchall()
+    finally:
+        conn.close()
+    return {**dict(zip(_BATCH_COLUMNS, row)), 'items': [dict(zip(_JOB_COLUMNS, item)) for item in items]}
+
+def discard_batch(batch_id, uploads=()):
+    """Delete a batch that never started, its item jobs and their uploads"""
+    batch = load_batch(batch_id)
+    for item in batch['items'] if batch else []:
+        discard_job(item)
+    for upload_path in uploads:
+        if os.path.exists(upload_path):
+            os.unlink(upload_path)
+    conn = init_db()
+    try:
+        with conn:
+            conn.execute("DELETE FROM transcription_batches WHERE id = ?", (batch_id,))
+    finally:
         conn.close()
-        
-        # Save transcription file
-        transcription_file = f"Results/transcription_{transcription_id}.txt"
-        with open(transcription_file, 'w', encoding='utf-8') as f:
-            f.write(transcription)
 
-        # Clean up temporary files
+def reopen_batch(batch_id):
+    """Queue a finished batch's failed items again; returns how many items it has left to store"""
+    conn = init_db()
+    try:
+        with conn:
+            # Claimed by flipping the status, so two retries of the same batch cannot both start it
+            claimed = conn.execute("""UPDATE transcription_batches SET status = 'queued', error = NULL, finished_at = NULL
+                                      WHERE id = ? AND status IN ('completed', 'failed')""", (batch_id,)).rowcount
+            if not claimed:
+                return 0
+            conn.execute("""UPDATE transcription_jobs SET status = 'pending', error = NULL, updated_at = CURRENT_TIMESTAMP
+                            WHERE batch_id = ? AND status = 'failed'""", (batch_id,))
+            remaining = conn.execute("""SELECT COUNT(*) FROM transcription_jobs
+                                        WHERE batch_id = ? AND status IN ('pending', 'running', 'transcribed')""",
+                                     (batch_id,)).fetchone()[0]
+            if not remaining:
+                conn.rollback()
+            return remaining
+    finally:
+        conn.close()
+
+def _add_batch_item(batch, upload_path, original_name):
+    """Record a saved upload as a batch item job"""
+    batch['uploads'].append(upload_path)
+    create_job(os.path.basename(upload_path), upload_path, os.path.getsize(upload_path), "en",
+               batch['priority'], batch['user'], batch_id=batch['id'], original_name=original_name,
+               duration=get_audio_duration(upload_path))
+
+def _extract_zip_recordings(zip_path, timestamp, batch):
+    """Extract audio members of a ZIP archive into Uploads as batch items"""
+    import zipfile
+
+    with zipfile.ZipFile(zip_path) as archive:
+        for member in archive.infolist():
+            if member.is_dir() or not member.filename.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            member_name = secure_filename(member.filename.replace('/', '_'))
+            upload_path = os.path.join('Uploads', f"{timestamp}_{len(batch['uploads'])}_{member_name}")
+            with archive.open(member) as source, open(upload_path, 'wb') as target:
+                shutil.copyfileobj(source, target)
+            _add_batch_item(batch, upload_path, member.filename)
+
+def _collect_import_directory(directory, timestamp, batch):
+    """Copy recordings from a directory under BATCH_IMPORT_DIR into Uploads as batch items"""
+    import_root = os.path.realpath(BATCH_IMPORT_DIR)
+    source_dir = os.path.realpath(os.path.join(import_root, directory))
+    if os.path.commonpath([import_root, source_dir]) != import_root or not os.path.isdir(source_dir):
+        raise ValueError(f"Directory must be an existing folder inside {BATCH_IMPORT_DIR}")
+
+    for root, _, names in os.walk(source_dir):
+        for name in sorted(names):
+            if not name.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            upload_path = os.path.join('Uploads', f"{timestamp}_{len(batch['uploads'])}_{secure_filename(name)}")
+            shutil.copyfile(os.path.join(root, name), upload_path)
+            _add_batch_item(batch, upload_path, os.path.relpath(os.path.join(root, name), source_dir))
+
+def _transcribe_batch_item(batch, item):
+    """Transcribe one claimed batch item, checkpointing its chunks and staging the result on its job row"""
+    try:
+        update_job(item['id'], status='running', error=None)
+        metrics = start_job_metrics()
+        diarization = start_diarization(item['upload_path'])
+        (transcription, segments), used_mode = run_transcription(
+            item['upload_path'], item['language'], priority=batch['priority'], user=batch['user'],
+            duration=item['duration'], job_id=item['id'])
+        segments = attach_speakers(segments, diarization)
+        update_job(item['id'], status='transcribed', transcription=format_transcription(transcription),
+                   segments=json.dumps(segments), transcription_mode=used_mode,
+                   upload_metrics=json.dumps(metrics) if metrics['online_requests'] else None)
+    except Exception as e:
+        logger.error(f"Batch {batch['id']}: failed to transcribe {item['filename']}: {str(e)}")
+        update_job(item['id'], status='failed', error=str(e))
+    finally:
+        with _active_jobs_lock:
+            _active_jobs.discard(item['id'])
+
+def _store_batch(batch_id):
+    """Store every transcribed item of a batch in one transaction, loading staged results one at a time"""
+    stored = []
+    conn = init_db()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            job_ids = [row[0] for row in cursor.execute(
+                "SELECT id FROM transcription_jobs WHERE batch_id = ? AND status = 'transcribed' ORDER BY id",
+                (batch_id,)).fetchall()]
+            for job_id in job_ids:
+                filename, file_size, transcription, segments = cursor.execute(
+                    "SELECT filename, file_size, transcription, segments FROM transcription_jobs WHERE id = ?",
+                    (job_id,)).fetchone()
+                transcription_id = insert_transcription(cursor, filename, transcription, file_size, json.loads(segments))
+                mark_job_completed(cursor, job_id, transcription_id)
+                stored.append((job_id, transcription_id))
+    finally:
+        conn.close()
+    count_transcriptions(len(stored))
+    return stored
+
+def _finish_batch_item(job_id, transcription_id):
+    """Write a stored batch item's result file and audio fingerprint"""
+    conn = init_db()
+    try:
+        transcription = conn.execute("SELECT transcription FROM transcriptions WHERE id = ?",
+                                     (transcription_id,)).fetchone()[0]
+        save_transcription_file(transcription_id, transcription)
+        upload_path = load_job(job_id)['upload_path']
+        fingerprint = fingerprint_audio(upload_path) if INCREMENTAL_TRANSCRIPTION else None
+        if fingerprint is not None:
+            with conn:
+                save_fingerprint(conn.cursor(), transcription_id, fingerprint)
+    finally:
+        conn.close()
+
+def _run_batch(batch_id):
+    """Transcribe the unfinished items of a batch across the worker pool and store them in one transaction"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    batch = load_batch(batch_id)
+    started_at = time.time()
+    update_batch(batch_id, status='processing', started_at=started_at, error=None)
+
+    # Longest recordings first so the pool is not left waiting on one long tail job
+    queue = [item for item in batch['items'] if item['status'] in ('pending', 'running')]
+    queue.sort(key=lambda item: item['duration'] or item['file_size'] / 16000.0, reverse=True)
+    with ThreadPoolExecutor(max_workers=max(1, TRANSCRIPTION_WORKERS)) as executor:
+        for item in queue:
+            if claim_job(item['id']):
+                executor.submit(_transcribe_batch_item, batch, item)
+
+    try:
+        stored = _store_batch(batch_id)
+    except Exception as e:
+        logger.error(f"Batch {batch_id}: failed to store results: {str(e)}")
+        update_batch(batch_id, status='failed', error=str(e), finished_at=time.time())
+        return
+
+    # Result files and fingerprints are derived data, written once the rows are committed
+    for job_id, transcription_id in stored:
         try:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            _finish_batch_item(job_id, transcription_id)
         except Exception as e:
-            logger.warning(f"Failed to clean up temporary files: {str(e)}")
+            logger.warning(f"Batch {batch_id}: could not finish transcription {transcription_id}: {str(e)}")
+    finished_at = time.time()
+    update_batch(batch_id, status='completed', finished_at=finished_at)
+    progress = _batch_progress(load_batch(batch_id))
+    logger.info(f"Batch {batch_id} finished: {progress['completed']} completed, {progress['failed']} failed "
+                f"in {finished_at - started_at:.1f}s")
+
+def resume_interrupted_batches():
+    """Resume batches a previous process left queued or processing; drop ones still receiving uploads"""
+    conn = init_db()
+    try:
+        # Only batches from before this process started; newer ones belong to uploads in progress
+        rows = conn.execute("""SELECT id, status FROM transcription_batches
+                               WHERE status IN ('receiving', 'queued', 'processing') AND created_at < ?
+                               ORDER BY created_at""", (_startup['started_at'],)).fetchall()
+    finally:
+        conn.close()
+
+    for batch_id, status in rows:
+        if status == 'receiving':
+            logger.info(f"Discarding batch {batch_id}, interrupted while its uploads were received")
+            discard_batch(batch_id)
+        else:
+            logger.info(f"Resuming interrupted batch {batch_id}")
+            threading.Thread(target=_run_batch, args=(batch_id,), daemon=True).start()
+    return [batch_id for batch_id, status in rows if status != 'receiving']
+
+# Item job states, named as the batch progress endpoint reports them
+_BATCH_ITEM_STATUS = {'pending': 'queued', 'running': 'processing'}
+
+def _batch_progress(batch):
+    """Serialize batch state for the progress endpoint"""
+    items = batch['items']
+    done = [item for item in items if item['status'] in ('transcribed', 'completed')]
+    failed = sum(1 for item in items if item['status'] == 'failed')
+    total = len(items)
+    return {
+        'batch_id': batch['id'],
+        'status': batch['status'],
+        'total': total,
+        'completed': len(done),
+        'failed': failed,
+        'progress': round(100.0 * (len(done) + failed) / total, 1) if total else 100.0,
+        'total_seconds': round(sum(item['duration'] or 0 for item in items), 1),
+        'processed_seconds': round(sum(item['duration'] or 0 for item in done), 1),
+        'error': batch['error'],
+        'items': [{
+            'job_id': item['id'],
+            'filename': item['filename'],
+            'original_name': item['original_name'],
+            'duration': item['duration'],
+            'status': _BATCH_ITEM_STATUS.get(item['status'], item['status']),
+            'transcription_id': item['transcription_id'],
+            'transcription_mode': item['transcription_mode'],
+            'upload_metrics': json.loads(item['upload_metrics']) if item['upload_metrics'] else None,
+            'error': item['error'],
+            'download_url': f"/download/transcription/{item['transcription_id']}" if item['transcription_id'] else None
+        } for item in items]
+    }
+
+@app.route('/upload/batch', methods=['POST'])
+def upload_batch():
+    """Queue many recordings (files, ZIP archives or an import directory) as one batch"""
+    try:
+        files = [f for f in request.files.getlist('audio') if f.filename]
+        directory = request.form.get('directory')
+        if not files and not directory:
+            return jsonify({'error': 'No audio files, ZIP archive or directory provided'}), 400
+
+        priority = request.form.get('priority', 'bulk')
+        if priority not in PRIORITY_CLASSES:
+            return jsonify({'error': f"Invalid priority. Must be one of: {', '.join(PRIORITY_CLASSES)}"}), 400
+
+        offline_available = check_offline_availability()
+        online_available = check_online_availability()
+        
+        if not offline_available and not online_available:
+            return jsonify({'error': 'No transcription method available. Need either OpenAI API key or whisper.cpp setup.'}), 500
+
+        # Items are recorded as their files are saved, so a crash part way leaves nothing unaccounted for
+        batch = {'id': uuid.uuid4().hex[:12], 'priority': priority, 'user': request_user(), 'uploads': []}
+        create_batch(batch['id'], priority, batch['user'])
+
+        timestamp = str(int(time.time()))
+        for file in files:
+            filename = secure_filename(file.filename)
+            if filename.lower().endswith('.zip'):
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
+                    file.save(temp_file)
+                    zip_path = temp_file.name
+                try:
+                    _extract_zip_recordings(zip_path, timestamp, batch)
+                finally:
+                    os.unlink(zip_path)
+            else:
+                upload_path = os.path.join('Uploads', f"{timestamp}_{len(batch['uploads'])}_{filename}")
+                file.save(upload_path)
+                _add_batch_item(batch, upload_path, file.filename)
+
+        if directory:
+            _collect_import_directory(directory, timestamp, batch)
+
+        if not batch['uploads']:
+            raise ValueError('No audio recordings found in the upload')
+
+        update_batch(batch['id'], status='queued')
+        total_seconds = _batch_progress(load_batch(batch['id']))['total_seconds']
+        logger.info(f"Queued batch {batch['id']} with {len(batch['uploads'])} recordings ({total_seconds}s of audio)")
+        threading.Thread(target=_run_batch, args=(batch['id'],), daemon=True).start()
 
         return jsonify({
             'success': True,
-            'transcription': transcription,
+            'batch_id': batch['id'],
+            'total': len(batch['uploads']),
+            'status_url': f"/upload/batch/{batch['id']}"
+        }), 202
+
+    except Exception as e:
+        logger.error(f"Error queueing batch: {str(e)}")
+        if 'batch' in locals():
+            try:
+                discard_batch(batch['id'], batch['uploads'])
+            except Exception as cleanup_error:
+                logger.warning(f"Failed to clean up batch {batch['id']}: {str(cleanup_error)}")
+        status = 400 if isinstance(e, ValueError) else 500
+        return jsonify({'error': str(e)}), status
+
+@app.route('/upload/batch/<batch_id>', methods=['GET'])
+def batch_status(batch_id):
+    """Get progress for a queued batch"""
+    batch = load_batch(batch_id)
+    if batch is None or batch['status'] == 'receiving':
+        return jsonify({'error': 'Batch not found'}), 404
+    return jsonify(_batch_progress(batch))
+
+@app.route('/upload/batch/<batch_id>/resume', methods=['POST'])
+def resume_batch(batch_id):
+    """Retry the failed items of a finished batch and store them in one transaction"""
+    batch = load_batch(batch_id)
+    if batch is None or batch['status'] == 'receiving':
+        return jsonify({'error': 'Batch not found'}), 404
+    if batch['status'] in ('queued', 'processing'):
+        return jsonify({**_batch_progress(batch), 'error': 'Batch is already running'}), 409
+
+    remaining = reopen_batch(batch_id)
+    if not remaining:
+        return jsonify({**_batch_progress(load_batch(batch_id)), 'error': 'Batch has no failed items to retry'}), 409
+
+    logger.info(f"Retrying {remaining} items of batch {batch_id}")
+    threading.Thread(target=_run_batch, args=(batch_id,), daemon=True).start()
+    return jsonify({
+        'success': True,
+        'batch_id': batch_id,
+        'retried': remaining,
+        'status_url': f"/upload/batch/{batch_id}"
+    }), 202
+
+def live_decoder():
+    """How live windows are decoded: 'server', 'whisper-cli', or None when neither is available.
+
+    Windows overlap, so each second of audio is decoded several times; that is
+    never sent to the online API.
+    """
+    if WHISPER_SERVER_URL:
+        return 'server'
+    if check_offline_availability():
+        return 'whisper-cli'
+    return None
+
+def transcribe_window(pcm_bytes, language="en"):
+    """Transcribe a window of 16 kHz mono PCM, preferring a warm whisper.cpp server"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+        temp_file_path = temp_file.name
+    try:
+        with wave.open(temp_file_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(LIVE_SAMPLE_RATE)
+            wav_file.writeframes(pcm_bytes)
+
+        if WHISPER_SERVER_URL:
+            # whisper.cpp server keeps the model loaded between requests
+            import httpx
+            with open(temp_file_path, 'rb') as audio_file:
+                response = httpx.post(
+                    f"{WHISPER_SERVER_URL.rstrip('/')}/inference",
+                    files={'file': ('window.wav', audio_file, 'audio/wav')},
+                    data={'language': language, 'response_format': 'json', 'temperature': '0.0'},
+                    timeout=30
+                )
+            response.raise_for_status()
+            return response.json().get('text', '').strip()
+
+        # Each window is a short cold whisper-cli run; it skips the transcription queue, where it
+        # could wait minutes behind a bulk chunk, and starts as soon as memory allows
+        return transcribe_offline(temp_file_path, language, urgent=True)
+    finally:
+        if os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
+
+def _normalize_word(word):
+    return re.sub(r'[^\w]', '', word.lower())
+
+class LiveSession:
+    """Rolling-window live transcription for one streaming client.
+
+    PCM frames are kept in a ring buffer holding the last LIVE_WINDOW_SECONDS
+    of audio. Every LIVE_STEP_SECONDS the window is re-decoded; words are only
+    committed once two consecutive overlapping decodes agree on them. When
+    decodes take longer than that (a cold whisper-cli start per window), the
+    step widens to the measured decode time so the host is not kept saturated.
+    """
+
+    def __init__(self, language="en"):
+        self.language = language
+        self.started_at = time.time()
+        self.filename = f"{int(self.started_at)}_live_{uuid.uuid4().hex[:8]}.wav"
+        self.upload_path = os.path.join('Uploads', self.filename)
+        self._recording = wave.open(self.upload_path, 'wb')
+        self._recording.setnchannels(1)
+        self._recording.setsampwidth(2)
+        self._recording.setframerate(LIVE_SAMPLE_RATE)
+
+        self._window_bytes = int(LIVE_WINDOW_SECONDS * LIVE_SAMPLE_RATE) * 2
+        self._step_bytes = int(LIVE_STEP_SECONDS * LIVE_SAMPLE_RATE) * 2
+        self._buffer = bytearray()
+        self._total_bytes = 0
+        self._decoded_bytes = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self.committed = []
+        self._tentative = []
+        self._updates = []
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def add_frames(self, pcm_bytes):
+        """Append 16-bit mono PCM frames to the ring buffer and the session recording"""
+        if len(pcm_bytes) % 2:
+            pcm_bytes = pcm_bytes[:-1]
+        with self._condition:
+            self._recording.writeframes(pcm_bytes)
+            self._buffer.extend(pcm_bytes)
+            if len(self._buffer) > self._window_bytes:
+                del self._buffer[:len(self._buffer) - self._window_bytes]
+            self._total_bytes += len(pcm_bytes)
+            self._condition.notify()
+
+    def drain_updates(self):
+        """Return and clear pending partial results for the client"""
+        with self._condition:
+            updates, self._updates = self._updates, []
+        return updates
+
+    def _strip_overlap(self, words):
+        """Drop leading words of a hypothesis that repeat already committed text"""
+        committed = [_normalize_word(w) for w in self.committed[-30:]]
+        normalized = [_normalize_word(w) for w in words]
+        for skip in range(0, min(4, len(words))):
+            # A single-word overlap is only trusted at the very start of the window
+            min_size = 1 if skip == 0 else 2
+            for size in range(min(len(committed), len(words) - skip), min_size - 1, -1):
+                if committed[-size:] == normalized[skip:skip + size]:
+                    return words[skip + size:]
+        return words
+
+    def _decode(self, final=False):
+        with self._condition:
+            window = bytes(self._buffer)
+            self._decoded_bytes = self._total_bytes
+        if not window:
+            return
+
+        decode_started = time.time()
+        try:
+            words = self._strip_overlap(transcribe_window(window, self.language).split())
+        except Exception as e:
+            logger.warning(f"Live window decode failed: {str(e)}")
+            return
+        latency = time.time() - decode_started
+        if latency > LIVE_LATENCY_BUDGET:
+            logger.warning(f"Live decode took {latency:.2f}s, over the {LIVE_LATENCY_BUDGET}s budget")
+
+        # Skip steps rather than queue decodes back to back; at most half a window apart
+        # so consecutive windows still overlap enough to agree on words
+        step_seconds = min(max(LIVE_STEP_SECONDS, latency), LIVE_WINDOW_SECONDS / 2.0)
+
+        with self._condition:
+            if final:
+                stable = words
+            else:
+                # Local agreement: commit the prefix shared with the previous hypothesis
+                stable = []
+                for previous, current in zip(self._tentative, words):
+                    if _normalize_word(previous) != _normalize_word(current):
+                        break
+                    stable.append(current)
+            self.committed.extend(stable)
+            self._tentative = words[len(stable):]
+            self._updates.append({
+                'type': 'partial',
+                'committed': ' '.join(self.committed),
+                'tentative': ' '.join(self._tentative),
+                'audio_seconds': round(self._total_bytes / 2.0 / LIVE_SAMPLE_RATE, 1),
+                'latency_ms': int(latency * 1000),
+                'step_seconds': round(step_seconds, 1),
+                'over_budget': latency > LIVE_LATENCY_BUDGET
+            })
+            self._step_bytes = int(step_seconds * LIVE_SAMPLE_RATE) * 2
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and self._total_bytes - self._decoded_bytes < self._step_bytes:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            self._decode()
+
+    def close(self):
+        """Stop decoding, flush the remaining window and store the session transcript"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+        if self._total_bytes > self._decoded_bytes or self._tentative:
+            self._decode(final=True)
+        with self._condition:
+            self._recording.close()
+
+        transcription = format_transcription(' '.join(self.committed))
+        if not transcription:
+            os.unlink(self.upload_path)
+            return None
+        transcription_id = store_transcription(self.filename, transcription, os.path.getsize(self.upload_path))
+        logger.info(f"Live session saved as transcription {transcription_id} "
+                    f"({self._total_bytes / 2.0 / LIVE_SAMPLE_RATE:.1f}s of audio)")
+        return {
+            'type': 'final',
             'transcription_id': transcription_id,
-            'filename': safe_filename,
-            'transcription_mode': used_mode,
+            'transcription': transcription,
+            'filename': self.filename,
             'download_url': f'/download/transcription/{transcription_id}'
-        }), 200
-        
+        }
+
+def live_transcription(ws):
+    """Stream PCM frames from the browser and send back rolling partial results"""
+    session = None
+    if live_decoder() is None:
+        ws.send(json.dumps({'type': 'error',
+                            'error': 'Live transcription needs WHISPER_SERVER_URL or a local whisper.cpp setup'}))
+        return
+    try:
+        while True:
+            message = ws.receive(timeout=0.1)
+            if isinstance(message, (bytes, bytearray)):
+                if session is None:
+                    session = LiveSession()
+                session.add_frames(message)
+            elif message is not None:
+                control = json.loads(message)
+                if control.get('type') == 'start' and session is None:
+                    session = LiveSession(control.get('language', 'en'))
+                elif control.get('type') == 'stop':
+                    break
+            if session is not None:
+                for update in session.drain_updates():
+                    ws.send(json.dumps(update))
     except Exception as e:
-        logger.error(f"Error processing audio: {str(e)}")
-        # Clean up files if they exist
-        try:
-            if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-            if 'upload_path' in locals() and os.path.exists(upload_path):
-                os.unlink(upload_path)
-        except:
-            pass
-        return jsonify({'error': str(e)}), 500
+        logger.info(f"Live stream ended: {str(e)}")
+
+    if session is None:
+        return
+    result = session.close()
+    try:
+        for update in session.drain_updates():
+            ws.send(json.dumps(update))
+        ws.send(json.dumps(result or {'type': 'final', 'transcription_id': None, 'transcription': ''}))
+    except Exception:
+        pass
+
+if sock is not None:
+    sock.route('/ws/transcribe')(live_transcription)
 
 @app.route('/summarize', methods=['POST'])
 def summarize_transcription():
@@ -374,6 +2908,12 @@ def summarize_transcription():
         if not transcription:
             return jsonify({'error': 'No transcription provided'}), 400
 
+        # Prefer the stored speaker-labelled transcript; diarization is never re-run here
+        if transcription_id:
+            speaker_transcription = load_speaker_transcript(transcription_id)
+            if speaker_transcription:
+                transcription = speaker_transcription
+
         # Check if OpenAI API key is configured
         if not os.getenv('OPENAI_API_KEY'):
             return jsonify({'error': 'OpenAI API key required for summarization'}), 500
@@ -477,6 +3017,25 @@ def download_summary(transcription_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/segments/<int:transcription_id>')
+def get_segments(transcription_id):
+    """Get timestamped, speaker-labelled segments for a transcription"""
+    try:
+        conn = init_db()
+        c = conn.cursor()
+        c.execute("""SELECT start_time, end_time, speaker, text FROM segments
+                     WHERE transcription_id = ? ORDER BY idx""", (transcription_id,))
+        segments = [{
+            'start': row[0],
+            'end': row[1],
+            'speaker': row[2],
+            'text': row[3]
+        } for row in c.fetchall()]
+        conn.close()
+        return jsonify({'transcription_id': transcription_id, 'segments': segments})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/history')
 def get_history():
     """Get list of all processed transcriptions"""
@@ -496,25 +3055,51 @@ def get_history():
                 'file_size': row[3],
                 'has_summary': bool(row[4]),
                 'transcription_url': f'/download/transcription/{row[0]}',
-                'summary_url': f'/download/summary/{row[0]}' if row[4] else None
+                'summary_url': f'/download/summary/{row[0]}' if row[4] else None,
+                'status': 'completed'
             })
+
+        # Unfinished jobs are listed with their checkpointed progress; batch items only once they fail
+        c.execute(f"""SELECT {', '.join(_JOB_COLUMNS)} FROM transcription_jobs
+                      WHERE status != 'completed' AND (batch_id IS NULL OR status = 'failed')""")
+        history.extend(job_status(dict(zip(_JOB_COLUMNS, row))) for row in c.fetchall())
+        history.sort(key=lambda item: item['created_at'], reverse=True)
         
         conn.close()
         return jsonify(history)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/live', methods=['GET'])
+def liveness_probe():
+    """Liveness probe: the process is up and serving requests"""
+    return jsonify({'status': 'alive', 'uptime_seconds': round(time.time() - _startup['started_at'], 1)})
+
+@app.route('/ready', methods=['GET'])
+def readiness_probe():
+    """Readiness probe served entirely from cached state; startup work is started by the server, not here"""
+    offline_available, online_available = cached_availability()
+    ready = _startup['ready'] and (offline_available or online_available)
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'startup_complete': _startup['ready'],
+        'startup_error': _startup['error'],
+        'offline_available': offline_available,
+        'online_available': online_available,
+        'model_preloaded': _startup['model_preloaded'],
+        'total_transcriptions': _counters['total_transcriptions'],
+        'queue': scheduler.stats()
+    }), 200 if ready else 503
+
 @app.route('/health', methods=['GET'])
 def health_check():
     try:
         openai_configured = bool(os.getenv('OPENAI_API_KEY'))
         
-        # Check database
-        conn = init_db()
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM transcriptions")
-        total_transcriptions = c.fetchone()[0]
-        conn.close()
+        # Served from the cached counter after the first call
+        total_transcriptions = _counters['total_transcriptions']
+        if total_transcriptions is None:
+            total_transcriptions = load_counters()
         
         return jsonify({
             'status': 'healthy',
@@ -562,6 +3147,65 @@ def set_transcription_mode():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/queue-stats', methods=['GET'])
+def queue_stats():
+    """Get transcription queue wait times per priority class"""
+    return jsonify(scheduler.stats())
+
+@app.route('/models', methods=['GET'])
+def list_models():
+    """List available whisper models with their benchmark results"""
+    try:
+        benchmarks = load_model_benchmarks()
+        models = []
+        for model_path in discover_models():
+            name = os.path.basename(model_path)
+            size, english_only, quantization = parse_model_name(name)
+            benchmark = benchmarks.get(name)
+            models.append({
+                'model': name,
+                'size': size,
+                'english_only': english_only,
+                'quantization': quantization or 'f16',
+                'file_size': os.path.getsize(model_path),
+                'rtf': round(benchmark['rtf'], 3) if benchmark else None,
+                'benchmark_threads': benchmark['threads'] if benchmark else None,
+                'throughput_x_realtime': round(1.0 / benchmark['rtf'], 2) if benchmark and benchmark['rtf'] else None,
+                'selected': os.path.abspath(model_path) == os.path.abspath(WHISPER_MODEL_PATH)
+            })
+        return jsonify({'models': models, 'selection': model_selection_status()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/models/benchmark', methods=['POST'])
+def rerun_model_benchmark():
+    """Re-run the calibration benchmark in the background and re-select the model"""
+    if _model_selection['status'] == 'benchmarking':
+        return jsonify({'error': 'Benchmark already running'}), 409
+    _model_selection['mode'] = 'auto'
+    threading.Thread(target=auto_select_model, kwargs={'force_benchmark': True}, daemon=True).start()
+    return jsonify({'success': True, 'status_url': '/transcription-status'}), 202
+
+@app.route('/set-whisper-model', methods=['POST'])
+def set_whisper_model_route():
+    """Switch the whisper model at runtime"""
+    try:
+        data = request.get_json()
+        name = os.path.basename(data.get('model', ''))
+        matches = [path for path in discover_models() if os.path.basename(path) == name]
+        if not matches:
+            return jsonify({'error': f"Unknown model. Available: {', '.join(os.path.basename(p) for p in discover_models())}"}), 400
+
+        set_whisper_model(matches[0])
+        _model_selection['mode'] = 'fixed'
+        return jsonify({
+            'success': True,
+            'model_selection': model_selection_status(),
+            'message': f'Whisper model set to {name}'
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/transcription-status', methods=['GET'])
 def transcription_status():
     """Get current transcription capabilities and mode"""
@@ -575,6 +3219,11 @@ def transcription_status():
             'online_available': online_available,
             'whisper_cpp_path': WHISPER_CPP_PATH if offline_available else None,
             'whisper_model_path': WHISPER_MODEL_PATH if offline_available else None,
+            'model_selection': model_selection_status(),
+            'queue': scheduler.stats(),
+            'governor': governor.stats(),
+            'online_uploads': online_upload_stats(),
+            'live_streaming_available': sock is not None and live_decoder() is not None,
             'capabilities': {
                 'can_transcribe': offline_available or online_available,
                 'preferred_mode': 'offline' if offline_available and TRANSCRIPTION_MODE in ['offline', 'hybrid'] else 'online',
@@ -585,8 +3234,8 @@ def transcription_status():
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 if __name__ == '__main__':
-    # Initialize database
-    init_db()
+    # Initialize database and counters in the background so the server starts immediately
+    start_startup_tasks()
     
     # Check transcription capabilities
     offline_available = check_offline_availability()
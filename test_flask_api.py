@@ -3,6 +3,7 @@
 import requests
 import os
 import glob
+import time
 
 def test_health_endpoint():
     """Test the health endpoint"""
@@ -44,9 +45,9 @@ def test_upload_endpoint():
             data = response.json()
             if data.get('success'):
                 transcription = data.get('transcription', '')
-                print(f"✅ Upload successful!")
+                print(f"✅ Upload successful! (job {data.get('job_id')})")
                 print(f"📝 Transcription (first 100 chars): {transcription[:100]}...")
-                return transcription
+                return data
             else:
                 print(f"❌ Upload failed: {data.get('error')}")
                 return None
@@ -88,6 +89,111 @@ def test_summarize_endpoint(transcription):
         print(f"❌ Summarization test failed: {e}")
         return None
 
+def test_ready_endpoint():
+    """Test the readiness probe"""
+    try:
+        response = requests.get('http://localhost:9000/ready')
+        data = response.json()
+
+        if response.status_code in (200, 503) and data.get('status') in ('ready', 'not_ready'):
+            print(f"✅ Readiness endpoint working - {data['status']}")
+            return True
+        else:
+            print(f"❌ Readiness endpoint issue ({response.status_code}): {data}")
+            return False
+
+    except Exception as e:
+        print(f"❌ Readiness endpoint failed: {e}")
+        return False
+
+def test_models_endpoint():
+    """Test the whisper model registry endpoint"""
+    try:
+        response = requests.get('http://localhost:9000/models')
+        data = response.json()
+
+        if response.status_code == 200 and 'models' in data and 'selection' in data:
+            print(f"✅ Models endpoint working - {len(data['models'])} model(s), "
+                  f"selected {data['selection'].get('selected_model')}")
+            return True
+        else:
+            print(f"❌ Models endpoint issue ({response.status_code}): {data}")
+            return False
+
+    except Exception as e:
+        print(f"❌ Models endpoint failed: {e}")
+        return False
+
+def test_job_endpoints(job_id):
+    """Test job status, resume and discard for a completed upload job"""
+    try:
+        response = requests.get(f'http://localhost:9000/jobs/{job_id}')
+        data = response.json()
+        if response.status_code != 200 or data.get('status') != 'completed':
+            print(f"❌ Job status issue ({response.status_code}): {data}")
+            return False
+        print(f"✅ Job {job_id} status: completed (transcription {data.get('transcription_id')})")
+
+        # A completed job can be neither resumed nor discarded
+        for method, url in (('post', f'/jobs/{job_id}/resume'), ('delete', f'/jobs/{job_id}')):
+            response = getattr(requests, method)(f'http://localhost:9000{url}')
+            if response.status_code != 409 or response.json().get('error') != 'Job already completed':
+                print(f"❌ {method.upper()} {url} on a completed job returned {response.status_code}: {response.text}")
+                return False
+        print("✅ Completed job refuses resume and discard")
+
+        response = requests.get('http://localhost:9000/jobs/999999999')
+        if response.status_code != 404:
+            print(f"❌ Unknown job returned {response.status_code}")
+            return False
+        print("✅ Unknown job returns 404")
+        return True
+
+    except Exception as e:
+        print(f"❌ Job endpoint test failed: {e}")
+        return False
+
+def test_batch_endpoint(timeout=600):
+    """Test batch upload and poll its progress until it finishes"""
+    try:
+        audio_files = []
+        for ext in ['*.mp3', '*.wav', '*.m4a', '*.ogg']:
+            audio_files.extend(glob.glob(f"Uploads/{ext}"))
+
+        if not audio_files:
+            print("⚠️ No audio files found for testing batch upload")
+            return None
+
+        with open(audio_files[0], 'rb') as f:
+            response = requests.post('http://localhost:9000/upload/batch', files={'audio': f})
+        data = response.json()
+        if response.status_code != 202 or not data.get('status_url'):
+            print(f"❌ Batch upload failed with status {response.status_code}: {data}")
+            return False
+        print(f"📦 Batch {data['batch_id']} queued with {data['total']} recording(s)")
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            progress = requests.get(f"http://localhost:9000{data['status_url']}").json()
+            if progress.get('status') in ('completed', 'failed'):
+                break
+            time.sleep(2)
+
+        if progress.get('status') == 'completed' and progress.get('completed') == data['total']:
+            print(f"✅ Batch completed: {progress['completed']}/{data['total']} recording(s)")
+            retry = requests.post(f"http://localhost:9000{data['status_url']}/resume")
+            if retry.status_code != 409:
+                print(f"❌ Retrying a batch with no failed items returned {retry.status_code}")
+                return False
+            print("✅ Batch retry refused when nothing failed")
+            return True
+        print(f"❌ Batch did not complete: {progress}")
+        return False
+
+    except Exception as e:
+        print(f"❌ Batch test failed: {e}")
+        return False
+
 def main():
     print("🧪 Flask API Test Script")
     print("=" * 40)
@@ -97,11 +203,27 @@ def main():
         print("❌ Health check failed - make sure Flask app is running")
         return
     
+    # Test readiness and model registry endpoints
+    if not test_ready_endpoint() or not test_models_endpoint():
+        print("❌ Status endpoint tests failed")
+        return
+
     # Test upload endpoint
-    transcription = test_upload_endpoint()
-    if not transcription:
+    upload = test_upload_endpoint()
+    if not upload:
         print("❌ Upload test failed")
         return
+    transcription = upload.get('transcription', '')
+
+    # Test job endpoints for the upload's job
+    if not test_job_endpoints(upload.get('job_id')):
+        print("❌ Job endpoint tests failed")
+        return
+
+    # Test batch ingestion
+    if test_batch_endpoint() is False:
+        print("❌ Batch test failed")
+        return
     
     # Test summarize endpoint
     summary = test_summarize_endpoint(transcription)
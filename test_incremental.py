@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import wave
+
+RATE = 16000
+
+def speech_like(np, seconds, seed):
+    """Synthetic voiced syllables, hiss and pauses that behave like speech for fingerprinting"""
+    rng = np.random.default_rng(seed)
+    parts, total = [], 0
+    while total < seconds * RATE:
+        n = int(rng.uniform(0.08, 0.3) * RATE)
+        t = np.arange(n) / RATE
+        kind = rng.random()
+        if kind < 0.2:
+            part = np.zeros(n)
+        elif kind < 0.35:
+            part = 0.05 * np.diff(np.concatenate([[0], rng.standard_normal(n)]))
+        else:
+            f0 = rng.uniform(100, 240) * (1 + rng.uniform(-0.2, 0.2) * t / t[-1])
+            phase = 2 * np.pi * np.cumsum(f0) / RATE
+            f1, f2 = rng.uniform(300, 900), rng.uniform(900, 2500)
+            part = np.zeros(n)
+            for h in range(1, int(3800 / f0.mean()) + 1):
+                fh = f0.mean() * h
+                part += (np.exp(-((fh - f1) / 200) ** 2) + 0.6 * np.exp(-((fh - f2) / 300) ** 2) + 0.05) * np.sin(h * phase)
+            part *= rng.uniform(0.05, 0.25) / max(np.abs(part).max(), 1e-9)
+        ramp = min(160, n // 4)
+        envelope = np.ones(n)
+        envelope[:ramp] = np.linspace(0, 1, ramp)
+        envelope[-ramp:] = np.linspace(1, 0, ramp)
+        parts.append(part * envelope)
+        total += n
+    return np.concatenate(parts)[:int(seconds * RATE)]
+
+def write_wav(np, path, samples):
+    with wave.open(path, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes((np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes())
+
+def encode(source, target, *args):
+    subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-i', source, *args, target], check=True)
+
+def check(name, ok):
+    print(f"{'✅' if ok else '❌'} {name}")
+    return ok
+
+def main():
+    print("🧪 Testing incremental re-transcription fingerprints")
+    print("=" * 50)
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("⚠️ numpy is not installed, skipping")
+        return
+    if not shutil.which('ffmpeg'):
+        print("⚠️ ffmpeg is not installed, skipping")
+        return
+
+    repo = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(tempfile.mkdtemp(prefix='incremental-test-'))
+    sys.path.insert(0, repo)
+    import app
+
+    # The stored recording is an AAC encode of the first 150 s; the new upload is an MP3
+    # of the whole 240 s meeting, re-leveled and with an extra 3.371 s at the start
+    meeting = speech_like(np, 240, seed=7)
+    lead_in = 3.3712
+    write_wav(np, 'source.wav', meeting[:150 * RATE])
+    write_wav(np, 'extended.wav', np.concatenate([speech_like(np, lead_in, seed=99), meeting]) * 0.98)
+    write_wav(np, 'unrelated.wav', speech_like(np, 200, seed=3))
+    write_wav(np, 'shorter.wav', meeting[:100 * RATE])
+    encode('source.wav', 'source.m4a', '-c:a', 'aac', '-b:a', '48k')
+    encode('extended.wav', 'extended.mp3', '-b:a', '64k')
+    encode('unrelated.wav', 'unrelated.mp3', '-b:a', '64k')
+    encode('shorter.wav', 'shorter.ogg', '-c:a', 'libopus', '-b:a', '24k')
+
+    segments = [{'start': t, 'end': t + 5.0, 'text': f"segment {t}"} for t in range(0, 150, 5)]
+    conn = app.init_db()
+    source_id = app.insert_transcription(conn.cursor(), 'source.m4a', 'source', 1, segments,
+                                         app.fingerprint_audio('source.m4a'))
+    conn.commit()
+    conn.close()
+
+    results = []
+    plan = app.plan_incremental(app.fingerprint_audio('extended.mp3'), 240 + lead_in)
+    results.append(check("Re-encoded extension matches its source", plan is not None and plan['source_id'] == source_id))
+    if plan:
+        shift = plan['reused_segments'][0]['start']
+        results.append(check(f"Alignment found at {shift:.3f}s (expected {lead_in:.3f}s)", abs(shift - lead_in) < 0.02))
+        results.append(check(f"Reused {plan['reused_seconds']:.0f}s of 150s", plan['reused_seconds'] >= 140))
+        results.append(check("Extension patches the source", plan['patch']))
+
+    plan = app.plan_incremental(app.fingerprint_audio('unrelated.mp3'), 200)
+    results.append(check("Unrelated recording is transcribed in full", plan is None))
+
+    plan = app.plan_incremental(app.fingerprint_audio('shorter.ogg'), 100)
+    results.append(check("Shorter excerpt reuses segments", plan is not None and plan['reused_seconds'] >= 90))
+    results.append(check("Shorter excerpt does not overwrite the source", plan is not None and not plan['patch']))
+
+    if all(results):
+        print("\n🎉 All incremental transcription tests passed!")
+    else:
+        print("\n❌ Some incremental transcription tests failed")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()